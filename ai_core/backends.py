@@ -0,0 +1,96 @@
+import copy
+import torch
+import torch.nn as nn
+from torch.func import functional_call, stack_module_state
+from ai_core.informer import build_informer
+
+BACKENDS = ("eager", "int8", "torchscript", "onnx")
+
+
+def model_path(pair):
+    return f"models/informer_{pair}.pth"
+
+
+def torchscript_path(pair):
+    return f"models/export/informer_{pair}.ts"
+
+
+def onnx_path(pair):
+    return f"models/export/informer_{pair}.onnx"
+
+
+def artifact_path(pair, backend="eager"):
+    return {"eager": model_path, "int8": model_path, "torchscript": torchscript_path, "onnx": onnx_path}[backend](pair)
+
+
+class OnnxModel:
+    """ONNX Runtime CPU session behind the same tensor-in, tensor-out call as the torch models."""
+
+    def __init__(self, path):
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError("The onnx inference backend needs onnxruntime: pip install onnxruntime") from e
+        self.session = ort.InferenceSession(path, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def __call__(self, x):
+        out = self.session.run(None, {self.input_name: x.numpy()})[0]
+        return torch.from_numpy(out)
+
+    def eval(self):
+        return self
+
+
+class StackedModels:
+    """Eager models with the same layout run as one vmapped forward.
+
+    Each model keeps its own weights; they are stacked along a leading
+    model dimension so an ``(N, lookback, features)`` batch of windows, one
+    per model, goes through a single call instead of N.
+    """
+
+    def __init__(self, models):
+        self.params, self.buffers = stack_module_state(models)
+        # a weightless copy that only provides the forward code
+        self.base = copy.deepcopy(models[0]).to("meta")
+
+    @staticmethod
+    def same_layout(models):
+        shapes = [{k: v.shape for k, v in m.state_dict().items()} for m in models]
+        return all(s == shapes[0] for s in shapes[1:])
+
+    def _forward(self, params, buffers, x):
+        return functional_call(self.base, (params, buffers), (x.unsqueeze(0),)).squeeze(0)
+
+    def __call__(self, x):
+        return torch.vmap(self._forward)(self.params, self.buffers, x)
+
+
+def load_eager(pair):
+    model = build_informer(torch.load(model_path(pair), map_location="cpu"))
+    model.eval()
+    return model
+
+
+def quantize(model):
+    """Dynamic int8 quantization of the Linear layers for CPU inference."""
+    model = torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+    # the fused batch-first encoder path reads raw Linear weight tensors, which
+    # quantized Linear only exposes as methods, so keep these layers on the slow path
+    for module in model.modules():
+        if isinstance(module, nn.TransformerEncoderLayer):
+            module.activation_relu_or_gelu = False
+    return model
+
+
+def load_model(pair, backend="eager"):
+    if backend == "eager":
+        return load_eager(pair)
+    if backend == "int8":
+        return quantize(load_eager(pair))
+    if backend == "torchscript":
+        return torch.jit.load(torchscript_path(pair), map_location="cpu").eval()
+    if backend == "onnx":
+        return OnnxModel(onnx_path(pair))
+    raise ValueError(f"Unknown inference backend {backend!r}, expected one of {BACKENDS}")
@@ -0,0 +1,87 @@
+import time
+import argparse
+import joblib
+import numpy as np
+import torch
+from ai_core.backends import BACKENDS, load_model
+from ai_core.live_predict import to_signals
+from ai_core.registry import scaler_path
+from utils.candle_store import get_store
+
+
+def predict_history(model, scaled, lookback=48, pred_step=1, batch=4096):
+    """Scaled close predictions for every window of ``scaled`` that has a target."""
+    count = len(scaled) - lookback - pred_step
+    if count <= 0:
+        raise ValueError(f"need more than {lookback + pred_step} candles, got {len(scaled)}")
+    windows = torch.from_numpy(scaled).unfold(0, lookback, 1)[:count].transpose(1, 2)
+    out = np.empty(count, dtype=np.float32)
+    with torch.inference_mode():
+        for i in range(0, count, batch):
+            out[i:i + batch] = model(windows[i:i + batch].contiguous()).reshape(-1).numpy()
+    return out
+
+
+def evaluate(close, pred_close, lookback=48, pred_step=1, cost=0.0):
+    """Trade every signal from the window's last close to the predicted candle's close.
+
+    ``close`` is the full close series and ``pred_close`` the price predicted
+    for each window; ``cost`` is charged per buy or sell in price units.
+    """
+    count = len(pred_close)
+    entry = close[lookback - 1:lookback - 1 + count]
+    exit = close[lookback + pred_step:lookback + pred_step + count]
+    signals = to_signals(pred_close - entry)
+
+    trades = signals != 0
+    pnl = signals * (exit - entry) - cost * trades
+    equity = np.cumsum(pnl)
+    drawdown = np.maximum.accumulate(np.maximum(equity, 0)) - equity
+    n_trades = int(trades.sum())
+    return {
+        "bars": count,
+        "buys": int((signals == 1).sum()),
+        "sells": int((signals == -1).sum()),
+        "hit_rate": float((pnl[trades] > 0).mean()) if n_trades else float("nan"),
+        "pnl": float(equity[-1]),
+        "pnl_per_trade": float(pnl[trades].mean()) if n_trades else 0.0,
+        "max_drawdown": float(drawdown.max()),
+        "signals": signals,
+        "equity": equity,
+    }
+
+
+def backtest(pair, backend="eager", lookback=48, pred_step=1, batch=4096, cost=0.0):
+    """Walk the model for ``pair`` over its whole stored candle history."""
+    start = time.perf_counter()
+    scaler = joblib.load(scaler_path(pair))
+    _, values = get_store(pair).read()
+    # MinMaxScaler.transform without the DataFrame round-trip
+    scaled = (values * scaler.scale_ + scaler.min_).astype(np.float32)
+
+    model = load_model(pair, backend)
+    pred_scaled = predict_history(model, scaled, lookback, pred_step, batch)
+    inference = time.perf_counter() - start
+
+    pred_close = (pred_scaled - scaler.min_[3]) / scaler.scale_[3]
+    report = evaluate(np.asarray(values[:, 3]), pred_close, lookback, pred_step, cost)
+    report.update(pair=pair, backend=backend, inference_seconds=inference,
+                  seconds=time.perf_counter() - start)
+
+    print(f"{pair} | {report['bars']} bars | {report['buys']} buy / {report['sells']} sell "
+          f"| {report['bars'] / report['seconds']:.0f} bars/s ({report['inference_seconds']:.1f}s inference)")
+    print(f"  hit rate {report['hit_rate']:.2%} | PnL {report['pnl']:.5f} "
+          f"({report['pnl_per_trade']:.5f}/trade) | max drawdown {report['max_drawdown']:.5f}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backtest each pair's model over its stored candles.")
+    parser.add_argument("pairs", nargs="*", default=["XAU_USD", "EUR_USD", "GBP_USD", "USD_JPY", "AUD_USD"])
+    parser.add_argument("--backend", default="eager", choices=BACKENDS)
+    parser.add_argument("--batch", type=int, default=4096, help="windows per forward pass")
+    parser.add_argument("--cost", type=float, default=0.0, help="cost per trade in price units")
+    args = parser.parse_args()
+
+    for p in args.pairs:
+        backtest(p, args.backend, batch=args.batch, cost=args.cost)
@@ -0,0 +1,92 @@
+import os
+import argparse
+from contextlib import contextmanager
+import joblib
+import pandas as pd
+import torch
+from ai_core.backends import load_eager, load_model, onnx_path, torchscript_path
+from utils.candle_store import FEATURES, get_store
+
+
+@contextmanager
+def fastpath_disabled():
+    # the fused encoder fast path has no ONNX/TorchScript equivalent
+    enabled = torch.backends.mha.get_fastpath_enabled()
+    torch.backends.mha.set_fastpath_enabled(False)
+    try:
+        yield
+    finally:
+        torch.backends.mha.set_fastpath_enabled(enabled)
+
+
+def export_torchscript(model, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with fastpath_disabled():
+        scripted = torch.jit.script(model)
+    tmp = path + ".tmp"
+    scripted.save(tmp)
+    os.replace(tmp, path)
+    return path
+
+
+def export_onnx(model, path, lookback=48):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    example = torch.zeros(1, lookback, len(FEATURES))
+    tmp = path + ".tmp"
+    with fastpath_disabled(), torch.no_grad():
+        torch.onnx.export(
+            model, (example,), tmp,
+            input_names=["x"], output_names=["y"],
+            dynamic_axes={"x": {0: "batch"}, "y": {0: "batch"}},
+            opset_version=17, dynamo=False,
+        )
+    os.replace(tmp, path)
+    return path
+
+
+def holdout_windows(pair, lookback=48, count=256):
+    """The last ``count`` scaled windows of ``pair`` as a (count, lookback, 5) tensor."""
+    scaler = joblib.load(f"models/scalers/{pair}_scaler.pkl")
+    _, values = get_store(pair).tail(count + lookback - 1)
+    scaled = torch.tensor(scaler.transform(pd.DataFrame(values, columns=FEATURES)), dtype=torch.float32)
+    return scaled.unfold(0, lookback, 1).transpose(1, 2).contiguous()
+
+
+def check_parity(pair, backends=("torchscript", "onnx"), atol=1e-4, x=None):
+    """Max absolute difference between the eager model and each exported backend.
+
+    Raises ``AssertionError`` when a backend drifts further than ``atol``.
+    """
+    x = holdout_windows(pair) if x is None else x
+    eager = load_eager(pair)
+    with torch.no_grad():
+        expected = eager(x)
+        diffs = {b: (load_model(pair, b)(x) - expected).abs().max().item() for b in backends}
+    for backend, diff in diffs.items():
+        print(f"{pair} | {backend:<11} max |Δ| vs eager: {diff:.2e}")
+        assert diff <= atol, f"{pair}: {backend} output differs from eager by {diff:.2e} (atol {atol:.0e})"
+    return diffs
+
+
+def export_pair(pair, formats=("torchscript", "onnx"), check=True):
+    model = load_eager(pair)
+    paths = {}
+    if "torchscript" in formats:
+        paths["torchscript"] = export_torchscript(model, torchscript_path(pair))
+    if "onnx" in formats:
+        paths["onnx"] = export_onnx(model, onnx_path(pair))
+    print(f"Exported {pair}: {', '.join(paths.values())}")
+    if check:
+        check_parity(pair, tuple(paths))
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export trained informer models for scripted/ONNX inference.")
+    parser.add_argument("pairs", nargs="*", default=["XAU_USD", "EUR_USD", "GBP_USD", "USD_JPY", "AUD_USD"])
+    parser.add_argument("--formats", nargs="+", default=["torchscript", "onnx"], choices=["torchscript", "onnx"])
+    parser.add_argument("--no-check", action="store_true", help="skip the parity check against the eager model")
+    args = parser.parse_args()
+
+    for p in args.pairs:
+        export_pair(p, args.formats, check=not args.no_check)
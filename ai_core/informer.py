@@ -1,15 +1,64 @@
-import torch.nn as nn    
+import torch.nn as nn
+
+
+class DistilLayer(nn.Module):
+    """Informer self-attention distilling: conv + ELU + max-pool halving the sequence."""
+
+    def __init__(self, d_model):
+        super().__init__()
+        self.conv = nn.Conv1d(d_model, d_model, kernel_size=3, padding=1, padding_mode="circular")
+        self.norm = nn.BatchNorm1d(d_model)
+        self.act = nn.ELU()
+        self.pool = nn.MaxPool1d(kernel_size=3, stride=2, padding=1)
+
+    def forward(self, x):
+        x = self.pool(self.act(self.norm(self.conv(x.transpose(1, 2)))))
+        return x.transpose(1, 2)
+
+
 class SimpleInformer(nn.Module):
-    def __init__(self,input_dim,d_model=64,nhead=4,num_layers=2):
+    def __init__(self,input_dim,d_model=64,nhead=4,num_layers=2,batch_first=True,distil=False):
         super().__init__()
+        if distil and not batch_first:
+            raise ValueError("distil=True requires batch_first=True")
+        self.batch_first = batch_first
         self.input_proj=nn.Linear(input_dim,d_model)
-        encoder_layer = nn.TransformerEncoderLayer(d_model=d_model,nhead=nhead)
-        self.transformer = nn.TransformerEncoder(encoder_layer, num_layers=num_layers)
+        if distil:
+            # encoder layers interleaved with distilling layers that halve the sequence length
+            blocks = []
+            for i in range(num_layers):
+                blocks.append(nn.TransformerEncoderLayer(d_model=d_model,nhead=nhead,batch_first=True))
+                if i < num_layers - 1:
+                    blocks.append(DistilLayer(d_model))
+            self.transformer = nn.Sequential(*blocks)
+        else:
+            encoder_layer = nn.TransformerEncoderLayer(d_model=d_model,nhead=nhead,batch_first=batch_first)
+            self.transformer = nn.TransformerEncoder(encoder_layer, num_layers=num_layers, enable_nested_tensor=False)
 
         self.output_proj = nn.Linear(d_model, 1)
 
     def forward(self, x):
         x = self.input_proj(x)
-        x = x.permute(1, 0, 2)  
+        if self.batch_first:
+            x = self.transformer(x)
+            return self.output_proj(x[:, -1])
+        x = x.permute(1, 0, 2)
         x = self.transformer(x)
-        return self.output_proj(x[-1])
\ No newline at end of file
+        return self.output_proj(x[-1])
+
+
+def build_informer(state_dict, input_dim=5, nhead=4):
+    """A batch-first SimpleInformer matching the layout of ``state_dict``.
+
+    Checkpoints saved before batch_first existed have the same parameters,
+    so they load unchanged and skip the per-forward permute.
+    """
+    d_model = state_dict["input_proj.weight"].shape[0]
+    distil = "transformer.1.conv.weight" in state_dict
+    if distil:
+        num_layers = 1 + sum(1 for k in state_dict if k.startswith("transformer.") and k.endswith(".conv.weight"))
+    else:
+        num_layers = len({k.split(".")[2] for k in state_dict if k.startswith("transformer.layers.")})
+    model = SimpleInformer(input_dim, d_model=d_model, nhead=nhead, num_layers=num_layers, distil=distil)
+    model.load_state_dict(state_dict)
+    return model
@@ -1,33 +1,55 @@
+import numpy as np
 import torch
-import joblib
-from ai_core.informer import SimpleInformer
+from ai_core.registry import registry
 from utils.model_utils import load_latest_sequence
 
-def predict(pair):
-    x, _ = load_latest_sequence(pair)
-    scaler = joblib.load(f"models/scalers/{pair}_scaler.pkl")
+SIGNAL_THRESHOLD = 0.1
+
+
+def to_signal(diff):
+    if diff > SIGNAL_THRESHOLD:
+        return "buy"
+    elif diff < -SIGNAL_THRESHOLD:
+        return "sell"
+    return "hold"
+
+
+def to_signals(diff):
+    """Vectorized ``to_signal``: 1 for buy, -1 for sell, 0 for hold."""
+    return np.where(diff > SIGNAL_THRESHOLD, 1, np.where(diff < -SIGNAL_THRESHOLD, -1, 0))
 
-    model = SimpleInformer(input_dim=5)
-    model.load_state_dict(torch.load(f"models/informer_{pair}.pth"))
-    model.eval()
+
+def predict_batch(pairs, lookback=48):
+    """Signals for several pairs from their cached models and feature windows.
+
+    On the eager backend the pairs' weights are stacked and all windows go
+    through one vmapped forward; other backends run one forward per pair.
+    """
+    entries = [registry.get(pair) for pair in pairs]
+    x = [load_latest_sequence(pair, lookback, scaler=scaler)[0] for pair, (_, scaler) in zip(pairs, entries)]
+    stack = registry.stacked(pairs)
 
     with torch.no_grad():
-        pred_scaled = model(x).item()
+        if stack is not None:
+            pred_scaled = stack(torch.cat(x)).squeeze(-1).tolist()
+        else:
+            pred_scaled = [model(window).item() for (model, _), window in zip(entries, x)]
+
+    results = {}
+    for i, (pair, (_, scaler)) in enumerate(zip(pairs, entries)):
+        pred_close = scaler.inverse_transform([[0, 0, 0, pred_scaled[i], 0]])[0][3]
+        last_close = scaler.inverse_transform(x[i][0, -1].numpy().reshape(1, -1))[0][3]
 
-    pred_close = scaler.inverse_transform([[0, 0, 0, pred_scaled, 0]])[0][3]
-    last_close = scaler.inverse_transform(x[0, -1].numpy().reshape(1, -1))[0][3]
+        signal = to_signal(pred_close - last_close)
+        print(f"{pair}: Last=${last_close:.2f} | Pred=${pred_close:.2f} → Signal: {signal.upper()}")
 
-    diff = pred_close - last_close
-    if diff > 0.1:
-        signal = "buy"
-    elif diff < -0.1:
-        signal = "sell"
-    else:
-        signal = "hold"
+        results[pair] = {
+            "signal": signal,
+            "price": pred_close
+        }
 
-    print(f"{pair}: Last=${last_close:.2f} | Pred=${pred_close:.2f} → Signal: {signal.upper()}")
+    return results
 
-    return {
-        "signal": signal,
-        "price": pred_close
-    }
+
+def predict(pair):
+    return predict_batch([pair])[pair]
@@ -0,0 +1,89 @@
+import io
+import time
+import argparse
+import joblib
+import numpy as np
+import pandas as pd
+import torch
+from ai_core.backends import load_eager, quantize
+from ai_core.live_predict import to_signals
+from ai_core.registry import scaler_path
+from utils.candle_store import FEATURES, get_store
+
+
+def _size(model):
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.getbuffer().nbytes
+
+
+def _latency(model, x, repeats=20):
+    with torch.no_grad():
+        model(x[:1])
+        start = time.perf_counter()
+        for _ in range(repeats):
+            model(x[:1])
+    return (time.perf_counter() - start) / repeats
+
+
+def evaluate_quantization(pair, holdout=0.2, lookback=48, pred_step=1, batch=1024):
+    """Compare the fp32 and int8 models on the held-out tail of ``pair``'s candles.
+
+    Reports prediction error against the real next close for both models,
+    how far the int8 outputs drift from fp32, how often the two agree on
+    the buy/sell/hold signal, and their size and batch-1 latency.
+    """
+    scaler = joblib.load(scaler_path(pair))
+    _, values = get_store(pair).read()
+    scaled = torch.tensor(scaler.transform(pd.DataFrame(values, columns=FEATURES)), dtype=torch.float32)
+
+    count = len(scaled) - lookback - pred_step
+    start = int(count * (1 - holdout))
+    X = scaled.unfold(0, lookback, 1)[start:count].transpose(1, 2)
+    y = scaled[lookback + pred_step + start:, 3].numpy()
+
+    fp32 = load_eager(pair)
+    int8 = quantize(load_eager(pair))
+    with torch.no_grad():
+        out = {
+            name: torch.cat([model(X[i:i + batch].contiguous()) for i in range(0, len(X), batch)]).reshape(-1).numpy()
+            for name, model in (("fp32", fp32), ("int8", int8))
+        }
+
+    # inverse-transform the close column only
+    close_min, close_scale = scaler.min_[3], scaler.scale_[3]
+    to_price = lambda v: (v - close_min) / close_scale
+    last_close = to_price(X[:, -1, 3].numpy())
+    signals = {name: to_signals(to_price(o) - last_close) for name, o in out.items()}
+
+    report = {
+        "pair": pair,
+        "windows": len(X),
+        "fp32_mse": float(np.mean((out["fp32"] - y) ** 2)),
+        "int8_mse": float(np.mean((out["int8"] - y) ** 2)),
+        "max_abs_delta": float(np.max(np.abs(out["int8"] - out["fp32"]))),
+        "mean_abs_delta": float(np.mean(np.abs(out["int8"] - out["fp32"]))),
+        "signal_agreement": float(np.mean(signals["int8"] == signals["fp32"])),
+        "fp32_bytes": _size(fp32),
+        "int8_bytes": _size(int8),
+        "fp32_ms": _latency(fp32, X) * 1e3,
+        "int8_ms": _latency(int8, X) * 1e3,
+    }
+
+    print(f"{pair} | {report['windows']} held-out windows")
+    print(f"  MSE (scaled)    fp32 {report['fp32_mse']:.3e}   int8 {report['int8_mse']:.3e}")
+    print(f"  |int8 - fp32|   max {report['max_abs_delta']:.3e}   mean {report['mean_abs_delta']:.3e}")
+    print(f"  signal agreement {report['signal_agreement']:.2%}")
+    print(f"  size            fp32 {report['fp32_bytes'] / 1e6:.2f} MB   int8 {report['int8_bytes'] / 1e6:.2f} MB")
+    print(f"  batch-1 latency fp32 {report['fp32_ms']:.2f} ms   int8 {report['int8_ms']:.2f} ms")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Accuracy and latency of int8 dynamic quantization vs fp32.")
+    parser.add_argument("pairs", nargs="*", default=["XAU_USD", "EUR_USD", "GBP_USD", "USD_JPY", "AUD_USD"])
+    parser.add_argument("--holdout", type=float, default=0.2, help="fraction of the newest windows to evaluate on")
+    args = parser.parse_args()
+
+    for p in args.pairs:
+        evaluate_quantization(p, args.holdout)
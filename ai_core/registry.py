@@ -0,0 +1,98 @@
+import os
+import threading
+import joblib
+from ai_core.backends import BACKENDS, StackedModels, artifact_path, load_model
+
+
+def scaler_path(pair):
+    return f"models/scalers/{pair}_scaler.pkl"
+
+
+class ModelRegistry:
+    """Keeps each pair's model and scaler in memory, reloading a pair only
+    when its model artifact or scaler file changes on disk.
+
+    ``backend`` picks the model runtime: eager PyTorch, eager with int8
+    dynamically quantized Linear layers, a TorchScript export or ONNX
+    Runtime (see ``ai_core.export``). Quantized modules are built once per
+    weights file and cached like any other backend.
+
+    For the eager backend, ``stacked`` also keeps the weights of a set of
+    pairs stacked for one vmapped forward, rebuilt when any of them reloads.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or os.getenv("INFERENCE_BACKEND", "eager")
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unknown inference backend {self.backend!r}, expected one of {BACKENDS}")
+        self._entries = {}
+        self._stacks = {}
+        self._lock = threading.Lock()
+
+    def _mtimes(self, pair):
+        return os.path.getmtime(artifact_path(pair, self.backend)), os.path.getmtime(scaler_path(pair))
+
+    def _load(self, pair):
+        model = load_model(pair, self.backend)
+        scaler = joblib.load(scaler_path(pair))
+        return model, scaler
+
+    def get(self, pair):
+        mtimes = self._mtimes(pair)
+        entry = self._entries.get(pair)
+        if entry is not None and entry[0] == mtimes:
+            return entry[1], entry[2]
+
+        with self._lock:
+            entry = self._entries.get(pair)
+            if entry is None or entry[0] != mtimes:
+                model, scaler = self._load(pair)
+                entry = (mtimes, model, scaler)
+                self._entries[pair] = entry
+                print(f"Loaded model: {os.path.basename(artifact_path(pair, self.backend))}")
+        return entry[1], entry[2]
+
+    def stacked(self, pairs):
+        """A ``StackedModels`` over the models of ``pairs``, or None when the
+        backend is not eager or the models differ in layout."""
+        if self.backend != "eager" or len(pairs) < 2:
+            return None
+        entries = [self._entries.get(pair) for pair in pairs]
+        if None in entries:
+            return None
+        key = tuple(pairs)
+        mtimes = tuple(entry[0] for entry in entries)
+        stack = self._stacks.get(key)
+        if stack is not None and stack[0] == mtimes:
+            return stack[1]
+
+        with self._lock:
+            stack = self._stacks.get(key)
+            if stack is None or stack[0] != mtimes:
+                models = [entry[1] for entry in entries]
+                stack = (mtimes, StackedModels(models) if StackedModels.same_layout(models) else None)
+                self._stacks[key] = stack
+        return stack[1]
+
+    def warm(self, pairs):
+        for pair in pairs:
+            try:
+                self.get(pair)
+            except Exception as e:
+                print(f"Failed to load model for {pair}: {e}")
+
+    def set_backend(self, backend):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown inference backend {backend!r}, expected one of {BACKENDS}")
+        with self._lock:
+            self.backend = backend
+            self._entries.clear()
+            self._stacks.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._stacks.clear()
+
+
+registry = ModelRegistry()
@@ -0,0 +1,86 @@
+import time
+import asyncio
+import logging
+from datetime import timedelta
+from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter, TimedOut
+
+logger = logging.getLogger(__name__)
+
+# Telegram allows roughly 30 messages per second across all chats
+TELEGRAM_RATE = 25
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def render_message(predictions):
+    message = "📊🤖Latest Forex Predictions:\n\n"
+    for pred in predictions:
+        pair = pred["pair"].replace("_", "/")
+        signal = pred["signal"]
+        price = pred["predicted_price"]
+        message += f"• 📈🚀{pair}: {signal.upper()} @ {price:.3f}\n"
+    return message
+
+
+class Broadcaster:
+    """Delivers one rendered message to many chats under Telegram's rate limit.
+
+    ``on_blocked`` is awaited with the chat id when a user has blocked the
+    bot, so the caller can drop the subscriber.
+    """
+
+    def __init__(self, bot, rate=TELEGRAM_RATE, max_retries=3, backoff=1.0, on_blocked=None):
+        self.bot = bot
+        self.bucket = TokenBucket(rate)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.on_blocked = on_blocked
+
+    async def send(self, chat_id, text, **kwargs):
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire()
+            try:
+                await self.bot.send_message(chat_id=chat_id, text=text, **kwargs)
+                return True
+            except RetryAfter as e:
+                delay = e.retry_after
+                if isinstance(delay, timedelta):
+                    delay = delay.total_seconds()
+                logger.warning(f"Rate limited sending to {chat_id}, retrying in {delay}s")
+                await asyncio.sleep(delay)
+            except Forbidden:
+                logger.info(f"Chat {chat_id} blocked the bot")
+                if self.on_blocked:
+                    await self.on_blocked(chat_id)
+                return False
+            except BadRequest as e:
+                logger.warning(f"Could not send to {chat_id}: {e}")
+                return False
+            except (TimedOut, NetworkError) as e:
+                logger.warning(f"Error sending to {chat_id}: {e}")
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+        return False
+
+    async def broadcast(self, chat_ids, text, **kwargs):
+        results = await asyncio.gather(*(self.send(c, text, **kwargs) for c in chat_ids))
+        sent = sum(results)
+        logger.info(f"Broadcast delivered to {sent}/{len(results)} chats")
+        return sent
@@ -1,7 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from backend.database.models import Prediction
-from sqlalchemy import func
+from backend.database.models import Prediction, PredictionRollup, correct_case, is_resolved, utc_day
+from sqlalchemy import case, func, insert, literal, tuple_, update
+from datetime import datetime
 
 async def save_prediction(db: AsyncSession,pair: str,signal: str,predicted_price:float):
     new_prediction = Prediction(
@@ -14,6 +15,16 @@ async def save_prediction(db: AsyncSession,pair: str,signal: str,predicted_price
     await db.commit()
     await db.refresh(new_prediction)
 
+async def save_predictions(db: AsyncSession, rows):
+    """Insert a whole sweep ``[{"pair", "signal", "predicted_price"}]`` in one
+    round trip, returning the new ids and server timestamps."""
+    result = await db.execute(
+        insert(Prediction).returning(Prediction.id, Prediction.timestamp, sort_by_parameter_order=True),
+        rows,
+    )
+    saved = [{"id": id_, "timestamp": ts} for id_, ts in result.all()]
+    await db.commit()
+    return saved
 
 
 async def update_actual_price(db: AsyncSession, prediction_id: int , actual_price):
@@ -26,45 +37,161 @@ async def update_actual_price(db: AsyncSession, prediction_id: int , actual_pric
 
     return prediction
 
-async def get_prediction_history(db: AsyncSession,limit: int = 50):
-    result = await db.execute(select(Prediction).order_by(Prediction.timestamp.desc()).limit(limit))
-    return result.scalars().all()
+async def update_actual_prices(db: AsyncSession, updates):
+    """Bulk-write ``[{"id": ..., "actual_price": ...}]`` in one transaction."""
+    if not updates:
+        return
+    await db.execute(update(Prediction), updates)
+    await db.commit()
 
-async def calculate_accuracy(db: AsyncSession):
+HISTORY_COLUMNS = ("id", "pair", "signal", "predicted_price", "actual_price", "timestamp")
+
+
+async def get_prediction_history(db: AsyncSession, limit: int = 50, pair: str = None,
+                                 since: datetime = None, until: datetime = None,
+                                 before_ts: datetime = None, before_id: int = None, columns=HISTORY_COLUMNS):
+    """Newest-first rows of ``columns``, as tuples, one keyset page at a time.
+
+    Pass the last row's ``timestamp`` and ``id`` as ``before_ts`` and
+    ``before_id`` to get the next page; ``id`` and ``timestamp`` are always
+    selected so a cursor can be built.
+    """
+    columns = ["id", "timestamp"] + [c for c in columns if c not in ("id", "timestamp")]
+    query = select(*(getattr(Prediction, c) for c in columns))
+    if pair:
+        query = query.where(Prediction.pair == pair)
+    if since:
+        query = query.where(Prediction.timestamp >= since)
+    if until:
+        query = query.where(Prediction.timestamp < until)
+    if before_ts is not None and before_id is not None:
+        query = query.where(tuple_(Prediction.timestamp, Prediction.id) < tuple_(literal(before_ts, Prediction.timestamp.type), before_id))
+    elif before_ts is not None:
+        query = query.where(Prediction.timestamp < before_ts)
+    elif before_id is not None:
+        query = query.where(Prediction.id < before_id)
+
+    result = await db.execute(query.order_by(Prediction.timestamp.desc(), Prediction.id.desc()).limit(limit))
+    return columns, result.all()
+
+def _summary(total, correct):
+    return {
+        "total_predictions": total,
+        "correct_predictions": correct,
+        "accuracy_percent": round((correct / total) * 100, 2) if total > 0 else 0.0
+    }
+
+
+def _filters(pair, since, until):
+    """Raw-row and rollup filters for the same pair and time range.
+
+    Rollups hold whole days, so a rolled-up day counts when its date falls
+    in ``[since, until)``.
+    """
+    raw, rolled = [], []
+    if pair:
+        raw.append(Prediction.pair == pair)
+        rolled.append(PredictionRollup.pair == pair)
+    if since:
+        raw.append(Prediction.timestamp >= since)
+        rolled.append(PredictionRollup.day >= since.date())
+    if until:
+        raw.append(Prediction.timestamp < until)
+        rolled.append(PredictionRollup.day < until.date())
+    return raw, rolled
+
+
+def _merge_days(rows):
+    """Sum raw and rollup rows of the same (day, pair); raw days come back
+    as strings on SQLite and dates elsewhere, so both are keyed as text."""
+    merged = {}
+    for d, p, *counts in rows:
+        totals = merged.setdefault((str(d), p), [0] * len(counts))
+        for i, n in enumerate(counts):
+            totals[i] += n or 0
+    return merged
+
+
+async def calculate_accuracy(db: AsyncSession, pair: str = None, since: datetime = None,
+                             until: datetime = None, by_day: bool = False):
+    """Accuracy over raw predictions plus the daily rollups of expired ones."""
+    raw, rolled = _filters(pair, since, until)
+    filters = [is_resolved(), *raw]
+    rolled.append(PredictionRollup.resolved > 0)
+
+    correct = func.sum(correct_case())
     result = await db.execute(
-        select(Prediction).where(Prediction.actual_price != None)
+        select(Prediction.pair, Prediction.signal, func.count(), correct)
+        .where(*filters)
+        .group_by(Prediction.pair, Prediction.signal)
     )
-    predictions = result.scalars().all()
+    groups = result.all()
+    result = await db.execute(
+        select(PredictionRollup.pair, PredictionRollup.signal,
+               func.sum(PredictionRollup.resolved), func.sum(PredictionRollup.correct))
+        .where(*rolled)
+        .group_by(PredictionRollup.pair, PredictionRollup.signal)
+    )
+    groups += result.all()
 
-    if not predictions:
+    if not groups:
         return {"message": "No predictions with actual prices available."}
 
-    correct = 0
-    total = 0
-
-    for p in predictions:
-        predicted = p.predicted_price
-        actual = p.actual_price
-
-        if predicted is None or actual is None:
-            continue
-
-      
-        if p.signal == "buy" and actual > predicted:
-            correct += 1
-        elif p.signal == "sell" and actual < predicted:
-            correct += 1
-        elif p.signal == "hold":
-            
-            if abs(actual - predicted) / predicted < 0.001:
-                correct += 1
-
-        total += 1
-
-    accuracy = round((correct / total) * 100, 2) if total > 0 else 0.0
-
-    return {
-        "total_predictions": total,
-        "correct_predictions": correct,
-        "accuracy_percent": accuracy
-    }
+    by_pair, by_signal = {}, {}
+    for p, signal, n, c in groups:
+        for key, bucket in ((p, by_pair), (signal, by_signal)):
+            totals = bucket.setdefault(key, [0, 0])
+            totals[0] += n
+            totals[1] += c
+
+    total = sum(n for n, _ in by_pair.values())
+    summary = _summary(total, sum(c for _, c in by_pair.values()))
+    summary["by_pair"] = {k: _summary(*v) for k, v in by_pair.items()}
+    summary["by_signal"] = {k: _summary(*v) for k, v in by_signal.items()}
+
+    if by_day:
+        day = utc_day()
+        result = await db.execute(
+            select(day, Prediction.pair, func.count(), correct)
+            .where(*filters)
+            .group_by(day, Prediction.pair)
+        )
+        days = result.all()
+        result = await db.execute(
+            select(PredictionRollup.day, PredictionRollup.pair,
+                   func.sum(PredictionRollup.resolved), func.sum(PredictionRollup.correct))
+            .where(*rolled)
+            .group_by(PredictionRollup.day, PredictionRollup.pair)
+        )
+        days += result.all()
+        summary["by_day"] = [
+            {"day": d, "pair": p, **_summary(n, c)}
+            for (d, p), (n, c) in sorted(_merge_days(days).items())
+        ]
+
+    return summary
+
+
+async def get_daily_history(db: AsyncSession, pair: str = None, since: datetime = None, until: datetime = None):
+    """Per-day, per-pair prediction counts, newest first, from raw rows and rollups alike."""
+    raw, rolled = _filters(pair, since, until)
+    day = utc_day()
+    resolved = is_resolved()
+    result = await db.execute(
+        select(day, Prediction.pair, func.count(), func.count(case((resolved, 1))),
+               func.coalesce(func.sum(case((resolved, correct_case()), else_=0)), 0))
+        .where(*raw)
+        .group_by(day, Prediction.pair)
+    )
+    days = result.all()
+    result = await db.execute(
+        select(PredictionRollup.day, PredictionRollup.pair, func.sum(PredictionRollup.predictions),
+               func.sum(PredictionRollup.resolved), func.sum(PredictionRollup.correct))
+        .where(*rolled)
+        .group_by(PredictionRollup.day, PredictionRollup.pair)
+    )
+    days += result.all()
+    return [
+        {"day": d, "pair": p, "predictions": n, **_summary(r, c)}
+        for (d, p), (n, r, c) in sorted(_merge_days(days).items(), reverse=True)
+    ]
@@ -11,11 +11,38 @@ load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 
-engine = create_async_engine(DATABASE_URL, echo=False, poolclass=NullPool)
+def engine_options(url, pool=None):
+    """Engine keyword arguments for ``url``, tuned through DB_* env vars.
+
+    ``DB_POOL=null`` keeps the old connection-per-session behaviour, e.g.
+    when an external pooler such as pgbouncer sits in front of Postgres.
+    """
+    pool = pool or os.getenv("DB_POOL", "queue")
+    if pool == "null":
+        return {"poolclass": NullPool}
+    if ":memory:" in url:
+        return {}
+
+    options = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", 5)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 10)),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", 30)),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 1800)),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+    }
+    if url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {
+            "prepared_statement_cache_size": int(os.getenv("DB_STATEMENT_CACHE_SIZE", 500)),
+        }
+    return options
+
+
+engine = create_async_engine(DATABASE_URL, echo=False, **engine_options(DATABASE_URL))
 
 async_session = async_sessionmaker(
     autocommit=False,
     autoflush=False,
+    expire_on_commit=False,
     bind=engine,
     class_=AsyncSession
 )
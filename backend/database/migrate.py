@@ -1,12 +1,59 @@
+import os
+import json
 import asyncio
+import argparse
+from sqlalchemy import insert, select
 from database.db import engine, Base
-from database.models import Prediction,Accuracy
+from database.models import Prediction,Accuracy,Subscriber,PredictionRollup
+from database.retention import RETENTION_DAYS, retention_cutoff, roll_up
+
+USER_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "users.json")
 
 async def init_models():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     print("Tables created")
 
-if __name__ == "__main__":
-    asyncio.run(init_models())
+async def create_indexes():
+    """Add indexes declared on the models to tables created before them."""
+    async with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                await conn.run_sync(index.create, checkfirst=True)
+
+async def import_json_users():
+    """One-off import of the old backend/users.json subscriber list."""
+    if not os.path.exists(USER_FILE):
+        return
+    with open(USER_FILE) as f:
+        users = json.load(f)
+
+    async with engine.begin() as conn:
+        existing = set((await conn.execute(select(Subscriber.chat_id))).scalars())
+        rows = [{"chat_id": u} for u in dict.fromkeys(users) if u not in existing]
+        if rows:
+            await conn.execute(insert(Subscriber), rows)
+    os.replace(USER_FILE, USER_FILE + ".imported")
+    print(f"Imported {len(rows)} subscribers from {USER_FILE}")
+
+async def apply_retention(days=RETENTION_DAYS):
+    """Move raw predictions older than ``days`` days into daily rollups."""
+    cutoff = retention_cutoff(days)
+    async with engine.begin() as conn:
+        moved = await roll_up(conn, cutoff)
+    print(f"Rolled up {moved} predictions before {cutoff.date()}")
 
+async def main(retain=None):
+    await init_models()
+    await create_indexes()
+    await import_json_users()
+    if retain is not None:
+        await apply_retention(retain)
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create tables and indexes, import legacy users and apply retention.")
+    parser.add_argument("--retain", type=int, nargs="?", const=RETENTION_DAYS, default=None, metavar="DAYS",
+                        help=f"roll up raw predictions older than DAYS days (default {RETENTION_DAYS})")
+    args = parser.parse_args()
+    asyncio.run(main(args.retain))
@@ -1,16 +1,31 @@
-from sqlalchemy import Column,Integer,String,Float,DateTime
+from sqlalchemy import Column,Integer,BigInteger,String,Float,Date,DateTime,Index,and_,case,literal_column
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.sql import func
+from sqlalchemy.sql.functions import FunctionElement
 from .db import Base
 
+# SQLite's CURRENT_TIMESTAMP has no fractional seconds; bind parameters in the
+# same format so keyset comparisons on equal timestamps stay exact there
+Timestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"),
+    "sqlite",
+)
+
 class Prediction(Base):
     __tablename__ = "predictions"
+    __table_args__ = (
+        # back /history keyset pages, with or without a pair filter
+        Index("ix_predictions_pair_timestamp", "pair", "timestamp", "id"),
+        Index("ix_predictions_timestamp_id", "timestamp", "id"),
+    )
 
     id = Column(Integer,primary_key=True,index=True)
     pair = Column(String,index=True)
     signal = Column(String) 
     predicted_price = Column(Float)
     actual_price= Column(Float,nullable = True)
-    timestamp = Column(DateTime(timezone=True),server_default=func.now())
+    timestamp = Column(Timestamp,server_default=func.now())
 
     def as_dict(self):
         return {
@@ -22,6 +37,55 @@ class Prediction(Base):
             "timestamp": self.timestamp.isoformat() if self.timestamp else None
         }
 
+def is_resolved():
+    return and_(Prediction.actual_price.is_not(None), Prediction.predicted_price.is_not(None))
+
+
+class UtcDate(FunctionElement):
+    """Calendar date of a timestamp in UTC, whatever the session's time zone."""
+    type = Date()
+    inherit_cache = True
+
+
+@compiles(UtcDate)
+def _utc_date(element, compiler, **kw):
+    return compiler.process(func.date(*element.clauses), **kw)
+
+
+@compiles(UtcDate, "postgresql")
+def _utc_date_postgresql(element, compiler, **kw):
+    # date() of a timestamptz uses the session TimeZone; retention cuts at midnight UTC.
+    # 'UTC' is inlined so the expression is identical in SELECT and GROUP BY
+    return compiler.process(func.date(func.timezone(literal_column("'UTC'"), *element.clauses)), **kw)
+
+
+def utc_day():
+    return UtcDate(Prediction.timestamp)
+
+
+def correct_case():
+    """1 when a resolved prediction's signal matched the actual price, else 0."""
+    predicted = Prediction.predicted_price
+    actual = Prediction.actual_price
+    return case(
+        (and_(Prediction.signal == "buy", actual > predicted), 1),
+        (and_(Prediction.signal == "sell", actual < predicted), 1),
+        (and_(Prediction.signal == "hold", func.abs(actual - predicted) < 0.001 * func.abs(predicted)), 1),
+        else_=0,
+    )
+
+
+class PredictionRollup(Base):
+    """Daily per-pair, per-signal counts of predictions past the retention window."""
+    __tablename__ = "prediction_rollups"
+
+    day = Column(Date,primary_key=True)
+    pair = Column(String,primary_key=True)
+    signal = Column(String,primary_key=True)
+    predictions = Column(Integer,nullable=False,default=0)
+    resolved = Column(Integer,nullable=False,default=0)  # rows that had an actual price
+    correct = Column(Integer,nullable=False,default=0)
+
 #Redundant Table 
 class Accuracy(Base):
     __tablename__ = "accuracy"
@@ -31,3 +95,13 @@ class Accuracy(Base):
     total = Column(Integer, default=0)
     correct = Column(Integer, default=0)
     accuracy = Column(Float, default=0.0)
+
+
+class Subscriber(Base):
+    __tablename__ = "subscribers"
+
+    id = Column(Integer,primary_key=True)
+    chat_id = Column(BigInteger,unique=True,index=True,nullable=False)
+    pairs = Column(String,nullable=True)  # comma-separated, NULL means every pair
+    created_at = Column(DateTime(timezone=True),server_default=func.now())
+    updated_at = Column(DateTime(timezone=True),server_default=func.now(),onupdate=func.now())
@@ -0,0 +1,57 @@
+import os
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from .models import Prediction, PredictionRollup, correct_case, is_resolved, utc_day
+
+RETENTION_DAYS = int(os.getenv("PREDICTION_RETENTION_DAYS", 30))
+
+
+def retention_cutoff(days=RETENTION_DAYS, now=None):
+    """Midnight UTC ``days`` days ago, so a day is never split between raw rows and rollups."""
+    now = now or datetime.now(timezone.utc)
+    return (now - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _insert(conn):
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(PredictionRollup)
+    if dialect == "sqlite":
+        return sqlite.insert(PredictionRollup)
+    raise NotImplementedError(f"Prediction rollups are not supported on {dialect}")
+
+
+async def roll_up(conn, cutoff):
+    """Fold raw predictions older than ``cutoff`` into daily rollups and delete them.
+
+    Runs on an open connection so the copy and the delete commit together.
+    Returns the number of raw rows moved.
+    """
+    resolved = is_resolved()
+    day = utc_day()
+    summary = (
+        select(
+            day,
+            Prediction.pair,
+            Prediction.signal,
+            func.count(),
+            func.count(case((resolved, 1))),
+            func.coalesce(func.sum(case((resolved, correct_case()), else_=0)), 0),
+        )
+        .where(Prediction.timestamp < cutoff)
+        .group_by(day, Prediction.pair, Prediction.signal)
+    )
+    stmt = _insert(conn).from_select(
+        ["day", "pair", "signal", "predictions", "resolved", "correct"], summary
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["day", "pair", "signal"],
+        set_={
+            column: getattr(PredictionRollup, column) + getattr(stmt.excluded, column)
+            for column in ("predictions", "resolved", "correct")
+        },
+    )
+    await conn.execute(stmt)
+    result = await conn.execute(delete(Prediction).where(Prediction.timestamp < cutoff))
+    return result.rowcount
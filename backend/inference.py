@@ -0,0 +1,108 @@
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", 1))
+INFERENCE_MAX_QUEUE = int(os.getenv("INFERENCE_MAX_QUEUE", 4))
+
+
+class InferenceSaturated(RuntimeError):
+    """Raised when the inference queue is full; the API answers 503."""
+
+
+class InferenceService:
+    """Runs blocking model work off the event loop in a bounded thread pool.
+
+    Jobs are identified by a hashable ``key``. A job submitted while an
+    identical one is still pending joins it instead of running again, and
+    new jobs are rejected with ``InferenceSaturated`` once ``max_queue``
+    distinct jobs are outstanding. Torch releases the GIL during inference,
+    so threads keep the registry's loaded models shared with the API.
+    """
+
+    def __init__(self, workers=INFERENCE_WORKERS, max_queue=INFERENCE_MAX_QUEUE, window=1000):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = None
+        self._inflight = {}
+        self.running = 0
+        self._running_lock = threading.Lock()
+        self.submitted = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self._wait = deque(maxlen=window)
+        self._run = deque(maxlen=window)
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+        return self._executor
+
+    def _timed(self, queued_at, fn, args):
+        start = time.perf_counter()
+        self._wait.append(start - queued_at)
+        with self._running_lock:
+            self.running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._running_lock:
+                self.running -= 1
+            self._run.append(time.perf_counter() - start)
+
+    def _done(self, key, future):
+        self._inflight.pop(key, None)
+        if future.cancelled() or future.exception() is not None:
+            self.failed += 1
+        else:
+            self.completed += 1
+
+    async def run(self, key, fn, *args):
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            if len(self._inflight) >= self.max_queue:
+                self.rejected += 1
+                raise InferenceSaturated(f"Inference queue is full ({self.max_queue} jobs pending)")
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.executor, self._timed, time.perf_counter(), fn, args)
+            future.add_done_callback(lambda f: self._done(key, f))
+            self._inflight[key] = future
+            self.submitted += 1
+        # a caller that gives up must not cancel the job for the others sharing it
+        return await asyncio.shield(future)
+
+    def metrics(self):
+        def ms(samples, q):
+            return round(float(np.percentile(samples, q)) * 1e3, 2) if samples else None
+
+        wait, run = list(self._wait), list(self._run)
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "pending": len(self._inflight),
+            "running": self.running,
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "failed": self.failed,
+            "wait_ms": {"p50": ms(wait, 50), "p99": ms(wait, 99)},
+            "run_ms": {"p50": ms(run, 50), "p99": ms(run, 99)},
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+inference = InferenceService()
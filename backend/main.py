@@ -1,15 +1,31 @@
+import os
 import asyncio
 from fastapi import FastAPI
-from backend.router import router
+from backend.router import router, pairs
+from backend.signals import scheduler
+from backend.inference import inference
+from backend.database.db import engine
 from backend.telegram_bot import main
+from ai_core.registry import registry
+from utils.async_fetcher import client as candle_client
 
 app = FastAPI()
 app.include_router(router)
 
 @app.on_event("startup")
 async def startup():
+    await inference.run(("warm",), registry.warm, pairs)
+    if os.getenv("SIGNAL_SCHEDULER", "true").lower() == "true":
+        scheduler.start()
     asyncio.create_task(main())
 
+@app.on_event("shutdown")
+async def shutdown():
+    await scheduler.stop()
+    await candle_client.aclose()
+    await engine.dispose()
+    inference.shutdown()
+
 @app.get("/")
 async def home():
     return {"message": "welcome"}
\ No newline at end of file
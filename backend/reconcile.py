@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import pandas as pd
+from sqlalchemy import and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from backend.crud import update_actual_prices
+from backend.database.models import Prediction
+from backend.signals import PAIRS
+from utils.async_fetcher import sync_pairs
+from utils.candle_store import get_store
+from utils.data_fetcher import GRANULARITY_SECONDS
+
+HORIZON = timedelta(minutes=5)
+
+
+def match_candles(times, values, timestamps, horizon=HORIZON, granularity="M5"):
+    """Close of the candle covering ``timestamp + horizon`` for each prediction.
+
+    A horizon that falls in a market gap (weekend, holiday) resolves to the
+    first candle after it. Returns a boolean mask of predictions whose
+    horizon candle is already stored and the matching closes.
+    """
+    targets = (pd.to_datetime(timestamps, utc=True) + horizon).as_unit("ns").asi8
+    if len(times) == 0:
+        return np.zeros(len(targets), dtype=bool), np.empty(0)
+
+    bar = GRANULARITY_SECONDS[granularity] * 1_000_000_000
+    # first candle that ends after the target: the one covering it, or the next one after a gap
+    idx = np.searchsorted(times + bar, targets, side="right")
+    ok = idx < len(times)
+    return ok, values[idx[ok], 3]
+
+
+async def reconcile_actual_prices(db: AsyncSession, pairs=None, horizon=HORIZON, sync=True):
+    """Fill ``actual_price`` for every open prediction whose horizon has passed.
+
+    Each pair is synced once, predictions are matched to candles with a
+    time-indexed lookup and all updates are written in one transaction.
+    Predictions whose horizon candle falls before the first stored candle
+    can never match, so they are not selected again.
+    """
+    cutoff = datetime.now(timezone.utc) - horizon
+    bounds = []
+    for pair in pairs or PAIRS:
+        first = get_store(pair).first_time()
+        if first is None:
+            # nothing stored yet; the sync below downloads it
+            bounds.append(Prediction.pair == pair)
+        else:
+            bounds.append(and_(Prediction.pair == pair, Prediction.timestamp >= first.to_pydatetime() - horizon))
+    query = (
+        select(Prediction.id, Prediction.pair, Prediction.timestamp)
+        .where(Prediction.actual_price.is_(None))
+        .where(Prediction.timestamp <= cutoff)
+        .where(or_(*bounds))
+    )
+    rows = (await db.execute(query)).all()
+    if not rows:
+        return 0
+
+    by_pair = {}
+    for id_, pair, ts in rows:
+        by_pair.setdefault(pair, []).append((id_, ts))
+
+    if sync:
+        try:
+            await sync_pairs(list(by_pair))
+        except Exception as e:
+            print(f"❌ Candle sync failed, reconciling from stored candles: {e}")
+
+    updates = []
+    for pair, preds in by_pair.items():
+        ids, timestamps = zip(*preds)
+        ok, closes = match_candles(*get_store(pair).read(), timestamps, horizon)
+        ids = np.asarray(ids)[ok]
+        updates.extend({"id": int(i), "actual_price": float(c)} for i, c in zip(ids, closes))
+
+    await update_actual_prices(db, updates)
+    return len(updates)
@@ -1,74 +1,114 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from backend.database.db import get_db
 from backend.crud import (
-    save_prediction,
+    HISTORY_COLUMNS,
+    get_daily_history,
     get_prediction_history,
     calculate_accuracy,
-    update_actual_price
 )
-from utils.data_fetcher import fetch_pair
-from ai_core.live_predict import predict
-import asyncio
+from backend.inference import InferenceSaturated, inference
+from backend.reconcile import reconcile_actual_prices
+from backend.stream import broker
+from backend.signals import PAIRS, latest_signals, run_sweep, sweeps
+from datetime import datetime
+from typing import Optional
 router = APIRouter()
 
-pairs = ["XAU_USD", "EUR_USD", "GBP_USD", "USD_JPY", "AUD_USD"]
+pairs = PAIRS
 
 
 @router.get("/predict")
-async def run_prediction(db: AsyncSession = Depends(get_db)):
-    results = []
-    
-    for pair in pairs:
-        try:
-            fetch_pair(pair)
-            result = predict(pair)  
- 
-            await save_prediction(
-                db=db,
-                pair=pair,
-                signal=result["signal"],
-                
-                predicted_price=result["price"]
-            )
-
-            results.append({
-                "pair": pair,
-                "signal": result["signal"],
-                "predicted_price": result["price"]
-            })
-
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Prediction failed for {pair}: {str(e)}")
-
-    return {"predictions": results}
+async def run_prediction(fresh: bool = False):
+    snapshot = latest_signals.snapshot()
+    if snapshot is not None and not fresh:
+        return snapshot
+
+    try:
+        return await run_sweep(pairs)
+    except InferenceSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/signals/stream")
+async def stream_signals(
+    request: Request,
+    last_id: Optional[int] = None,
+    last_event_id: Optional[int] = Header(None),
+):
+    """Server-sent events, one per new prediction sweep, resumable by event id."""
+    resume = last_event_id if last_event_id is not None else last_id
+    return StreamingResponse(
+        broker.stream(request, resume),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/inference/metrics")
+async def inference_metrics():
+    return {**inference.metrics(), "predict_sweeps": sweeps.flights, "predict_shared": sweeps.shared,
+            "stream_subscribers": broker.subscribers}
 
 
 
 @router.get("/history")
-async def get_history(limit: int = 50, db: AsyncSession = Depends(get_db)):
-    predictions = await get_prediction_history(db, limit)
-    return {"history": [p.as_dict() for p in predictions]}  
+async def get_history(
+    limit: int = Query(50, ge=1, le=1000),
+    pair: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    before_ts: Optional[datetime] = None,
+    before_id: Optional[int] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    columns = fields.split(",") if fields else HISTORY_COLUMNS
+    unknown = set(columns) - set(HISTORY_COLUMNS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    columns, rows = await get_prediction_history(db, limit, pair, since, until, before_ts, before_id, columns)
+    history = []
+    for row in rows:
+        item = dict(zip(columns, row))
+        item["timestamp"] = item["timestamp"].isoformat() if item["timestamp"] else None
+        history.append(item)
+
+    cursor = None
+    if len(rows) == limit:
+        cursor = {"before_ts": history[-1]["timestamp"], "before_id": history[-1]["id"]}
+    return {"history": history, "next": cursor}
+
+
+@router.get("/history/daily")
+async def get_history_daily(
+    pair: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    return {"days": await get_daily_history(db, pair, since, until)}
 
 
 
 
 
 @router.get("/accuracy")
-async def update_and_calculate_accuracy(db: AsyncSession = Depends(get_db)):
-    predictions = await get_prediction_history(db, limit=50)
-
-  
-    predictions_data = [ {"id": p.id, "pair": p.pair} for p in predictions ]
-
-    for p in predictions_data:
-        try:
-            df = await asyncio.to_thread(fetch_pair, p["pair"])
-            if df.empty:
-                raise ValueError(f"No data for {p['pair']}")
-            actual_price = df.iloc[-1]["close"]
-            await update_actual_price(db, p["id"], actual_price)
-        except Exception as e:
-            print(f"❌ Error reading CSV or updating price for {p['pair']}: {e}")
-
-    return await calculate_accuracy(db)
\ No newline at end of file
+async def update_and_calculate_accuracy(
+    pair: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    by_day: bool = False,
+    db: AsyncSession = Depends(get_db),
+):
+    try:
+        await reconcile_actual_prices(db)
+    except Exception as e:
+        await db.rollback()
+        print(f"❌ Error reconciling actual prices: {e}")
+
+    return await calculate_accuracy(db, pair=pair, since=since, until=until, by_day=by_day)
\ No newline at end of file
@@ -0,0 +1,156 @@
+import os
+import time
+import asyncio
+from datetime import datetime, timezone
+from backend.crud import save_predictions
+from backend.database.db import async_session
+from backend.inference import InferenceSaturated, inference
+from backend.stream import broker
+from ai_core.live_predict import predict_batch
+from utils.async_fetcher import sync_pairs
+from utils.data_fetcher import GRANULARITY_SECONDS, last_candle_time
+
+PAIRS = ["XAU_USD", "EUR_USD", "GBP_USD", "USD_JPY", "AUD_USD"]
+GRANULARITY = "M5"
+BAR_DELAY = float(os.getenv("SIGNAL_BAR_DELAY", 10))
+
+
+class SignalCache:
+    """Latest prediction sweep, served to /predict without recomputing."""
+
+    def __init__(self):
+        self.version = 0
+        self.bar_time = None
+        self._snapshot = None
+
+    def update(self, predictions, bar_time):
+        self.version += 1
+        self.bar_time = bar_time
+        self._snapshot = {
+            "predictions": predictions,
+            "version": self.version,
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "bar_time": bar_time.isoformat() if bar_time is not None else None,
+        }
+        return self._snapshot
+
+    def snapshot(self):
+        return self._snapshot
+
+
+latest_signals = SignalCache()
+
+
+async def compute_signals(db, pairs=PAIRS, force=True):
+    """Sync candles, run one batched prediction and store the sweep.
+
+    With ``force=False`` the sweep is skipped when no pair has a new bar
+    since the cached one.
+    """
+    try:
+        await sync_pairs(pairs)
+    except Exception as e:
+        raise RuntimeError(f"Candle fetch failed: {e}") from e
+
+    bar_time = max((t for t in map(last_candle_time, pairs) if t is not None), default=None)
+    if not force and latest_signals.snapshot() is not None and bar_time == latest_signals.bar_time:
+        return latest_signals.snapshot()
+
+    try:
+        batch = await inference.run(("predict_batch", tuple(pairs)), predict_batch, list(pairs))
+    except InferenceSaturated:
+        raise
+    except Exception as e:
+        raise RuntimeError(f"Prediction failed: {e}") from e
+
+    results = [
+        {"pair": pair, "signal": batch[pair]["signal"], "predicted_price": float(batch[pair]["price"])}
+        for pair in pairs
+    ]
+    saved = await save_predictions(db, results)
+    for result, row in zip(results, saved):
+        result["id"] = row["id"]
+        result["timestamp"] = row["timestamp"].isoformat() if row["timestamp"] else None
+
+    snapshot = latest_signals.update(results, bar_time)
+    broker.publish(snapshot)
+    return snapshot
+
+
+class SingleFlight:
+    """Concurrent callers with the same key share one in-flight coroutine."""
+
+    def __init__(self):
+        self._inflight = {}
+        self.flights = 0
+        self.shared = 0
+
+    async def run(self, key, fn):
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(fn())
+            task.add_done_callback(lambda t: self._inflight.pop(key, None))
+            self._inflight[key] = task
+            self.flights += 1
+        else:
+            self.shared += 1
+        # one caller disconnecting must not cancel the sweep for the rest
+        return await asyncio.shield(task)
+
+
+sweeps = SingleFlight()
+
+
+def current_bar(granularity=GRANULARITY):
+    return int(time.time() // GRANULARITY_SECONDS[granularity])
+
+
+async def run_sweep(pairs=PAIRS, force=True):
+    """``compute_signals`` shared by every caller, API or scheduler, in the same bar."""
+    async def sweep():
+        # the sweep outlives any single caller, so it gets its own session
+        async with async_session() as db:
+            return await compute_signals(db, pairs, force=force)
+
+    return await sweeps.run((current_bar(), tuple(pairs)), sweep)
+
+
+class PredictionScheduler:
+    """Computes signals once per new bar, shortly after each bar closes."""
+
+    def __init__(self, pairs=PAIRS, granularity=GRANULARITY, delay=BAR_DELAY):
+        self.pairs = pairs
+        self.interval = GRANULARITY_SECONDS[granularity]
+        self.delay = delay
+        self._task = None
+
+    def seconds_until_next_bar(self):
+        return self.interval - time.time() % self.interval + self.delay
+
+    async def run_once(self):
+        try:
+            await run_sweep(self.pairs, force=False)
+        except Exception as e:
+            print(f"❌ Scheduled prediction failed: {e}")
+
+    async def _run(self):
+        await self.run_once()
+        while True:
+            await asyncio.sleep(self.seconds_until_next_bar())
+            await self.run_once()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+scheduler = PredictionScheduler()
@@ -0,0 +1,76 @@
+import os
+import json
+import asyncio
+from collections import deque
+
+HEARTBEAT = float(os.getenv("STREAM_HEARTBEAT", 15))
+
+
+class SignalBroker:
+    """Fans each new prediction sweep out to server-sent event subscribers.
+
+    Every sweep becomes one event whose id is the signal cache version.
+    The last ``history`` events are kept so a client that reconnects with
+    ``Last-Event-ID`` gets what it missed. A subscriber that falls
+    ``queue_size`` events behind is dropped and resumes on reconnect.
+    """
+
+    def __init__(self, history=64, queue_size=16):
+        self._events = deque(maxlen=history)
+        self._subscribers = set()
+        self.queue_size = queue_size
+
+    @property
+    def subscribers(self):
+        return len(self._subscribers)
+
+    def publish(self, snapshot):
+        event = (snapshot["version"], f"id: {snapshot['version']}\nevent: signals\ndata: {json.dumps(snapshot)}\n\n")
+        self._events.append(event)
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # too far behind: drop everything undelivered and end its stream, so
+                # the client's last id is the last event it got and a reconnect replays the rest
+                self._subscribers.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    def backlog(self, last_id=None):
+        """Buffered events after ``last_id``, or just the latest without one.
+
+        An id newer than anything buffered comes from before a restart,
+        when versions started over, so the whole buffer is replayed.
+        """
+        if not self._events:
+            return []
+        if last_id is None:
+            return [self._events[-1]]
+        if last_id > self._events[-1][0]:
+            return list(self._events)
+        return [event for event in self._events if event[0] > last_id]
+
+    async def stream(self, request, last_id=None):
+        queue = asyncio.Queue(self.queue_size)
+        self._subscribers.add(queue)
+        backlog = self.backlog(last_id)
+        try:
+            yield "retry: 3000\n\n"
+            for _, message in backlog:
+                yield message
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if event is None:
+                    break
+                yield event[1]
+        finally:
+            self._subscribers.discard(queue)
+
+
+broker = SignalBroker()
@@ -0,0 +1,60 @@
+from sqlalchemy import delete, exists, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from backend.database.models import Subscriber
+
+
+def _insert(db: AsyncSession):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(Subscriber)
+    if dialect == "sqlite":
+        return sqlite.insert(Subscriber)
+    raise NotImplementedError(f"Subscriber upserts are not supported on {dialect}")
+
+
+def _pairs_value(pairs):
+    return ",".join(sorted(set(pairs))) if pairs else None
+
+
+async def add_subscriber(db: AsyncSession, chat_id: int):
+    """Subscribe ``chat_id``, keeping existing preferences if already subscribed."""
+    stmt = _insert(db).values(chat_id=chat_id).on_conflict_do_nothing(index_elements=["chat_id"])
+    await db.execute(stmt)
+    await db.commit()
+
+
+async def upsert_subscriber(db: AsyncSession, chat_id: int, pairs=None):
+    """Subscribe ``chat_id`` or update its pairs in one atomic statement.
+
+    ``pairs=None`` means every pair.
+    """
+    value = _pairs_value(pairs)
+    stmt = _insert(db).values(chat_id=chat_id, pairs=value)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["chat_id"],
+        set_={"pairs": value, "updated_at": func.now()},
+    )
+    await db.execute(stmt)
+    await db.commit()
+
+
+async def remove_subscriber(db: AsyncSession, chat_id: int):
+    result = await db.execute(delete(Subscriber).where(Subscriber.chat_id == chat_id))
+    await db.commit()
+    return result.rowcount > 0
+
+
+async def is_subscribed(db: AsyncSession, chat_id: int):
+    result = await db.execute(select(exists().where(Subscriber.chat_id == chat_id)))
+    return result.scalar()
+
+
+async def list_subscribers(db: AsyncSession):
+    """``{pairs: [chat_id, ...]}`` grouped by preference, ``None`` meaning every pair."""
+    result = await db.execute(select(Subscriber.chat_id, Subscriber.pairs))
+    groups = {}
+    for chat_id, pairs in result.all():
+        groups.setdefault(tuple(pairs.split(",")) if pairs else None, []).append(chat_id)
+    return groups
@@ -10,28 +10,55 @@ from telegram.ext import (
     CallbackQueryHandler,
 )
 from dotenv import load_dotenv
+from backend.broadcaster import Broadcaster, render_message
+from backend.database.db import async_session
+from backend.signals import PAIRS
+from backend.subscribers import add_subscriber, list_subscribers, remove_subscriber, upsert_subscriber
 
 load_dotenv()
 
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 FASTAPI_URL = os.getenv("FAST_API_URL", "http://127.0.0.1:8000")  
+BROADCAST_INTERVAL = 900
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-user_jobs = {}  
+_session = None
+broadcaster = None
 
-async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
+
+def stop_markup():
     keyboard = [
         [InlineKeyboardButton("Stop Predictions", callback_data="stop_predictions")]
     ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    return InlineKeyboardMarkup(keyboard)
+
+
+async def fetch_predictions():
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=120))
+    async with _session.get(f"{FASTAPI_URL}/predict") as response:
+        response.raise_for_status()
+        data = await response.json()
+        return data.get("predictions", [])
+
+
+async def unsubscribe(chat_id):
+    async with async_session() as db:
+        return await remove_subscriber(db, chat_id)
+
+
+async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text(
         "Welcome to the Forex Signal Bot 📈. Type /predict to get the latest signals.\n"
         "Or wait for automatic predictions every 15 minutes.",
-        reply_markup=reply_markup,
+        reply_markup=stop_markup(),
     )
-    await schedule_prediction_job(update.effective_chat.id, context)
+    async with async_session() as db:
+        await add_subscriber(db, update.effective_chat.id)
+    await send_prediction(update.effective_chat.id, context)
 
 
 async def predict_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -39,65 +66,69 @@ async def predict_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def send_prediction(chat_id, context):
     try:
-        timeout = aiohttp.ClientTimeout(total=120)  
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.get(f"{FASTAPI_URL}/predict") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    predictions = data.get("predictions", [])
-                    message = "📊🤖Latest Forex Predictions:\n\n"
-
-                    for pred in predictions:
-                        pair = pred["pair"].replace("_", "/")
-                        signal = pred["signal"]
-                        price = pred["predicted_price"]
-                        message += f"• 📈🚀{pair}: {signal.upper()} @ {price:.3f}\n"
-
-                    keyboard = [
-                        [InlineKeyboardButton("Stop Predictions", callback_data="stop_predictions")]
-                    ]
-                    reply_markup = InlineKeyboardMarkup(keyboard)
-                    await context.bot.send_message(chat_id=chat_id, text=message, reply_markup=reply_markup)
-                else:
-                    await context.bot.send_message(chat_id=chat_id, text="⚠️ Failed to fetch predictions from the server.")
+        predictions = await fetch_predictions()
     except Exception as e:
         logger.error(f"Error fetching predictions: {e}")
-        await context.bot.send_message(chat_id=chat_id, text="❌ Error occurred while getting predictions.")
+        await context.bot.send_message(chat_id=chat_id, text="⚠️ Failed to fetch predictions from the server.")
+        return
+    await broadcaster.send(chat_id, render_message(predictions), reply_markup=stop_markup())
 
 
-async def prediction_job(context: ContextTypes.DEFAULT_TYPE):
-    chat_id = context.job.chat_id
-    await send_prediction(chat_id, context)
+async def broadcast_job(context: ContextTypes.DEFAULT_TYPE):
+    async with async_session() as db:
+        groups = await list_subscribers(db)
+    if not groups:
+        return
 
-
-async def schedule_prediction_job(chat_id, context):
-    
-    if chat_id in user_jobs:
-        user_jobs[chat_id].schedule_removal()
-    job = context.job_queue.run_repeating(
-        prediction_job, interval=900, first=0, chat_id=chat_id  # Changed interval to 60 seconds (1 minute)
-    )
-    user_jobs[chat_id] = job
+    try:
+        predictions = await fetch_predictions()
+    except Exception as e:
+        logger.error(f"Error fetching predictions for broadcast: {e}")
+        return
+
+    # one message per distinct pair preference, not per chat
+    for pairs, chat_ids in groups.items():
+        selected = [p for p in predictions if pairs is None or p["pair"] in pairs]
+        if selected:
+            await broadcaster.broadcast(chat_ids, render_message(selected), reply_markup=stop_markup())
+
+
+async def pairs_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    pairs = [a.upper().replace("/", "_") for a in context.args]
+    unknown = [p for p in pairs if p not in PAIRS]
+    if unknown:
+        await update.message.reply_text(
+            f"❌ Unknown pair: {', '.join(unknown)}. Valid pairs: {', '.join(PAIRS)}"
+        )
+        return
+    async with async_session() as db:
+        await upsert_subscriber(db, update.effective_chat.id, pairs or None)
+    if pairs:
+        await update.message.reply_text(f"✅ You will receive signals for: {', '.join(pairs)}")
+    else:
+        await update.message.reply_text("✅ You will receive signals for every pair.")
 
 
 async def stop_predictions_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
     chat_id = query.message.chat_id
-    if chat_id in user_jobs:
-        user_jobs[chat_id].schedule_removal()
-        del user_jobs[chat_id]
+    if await unsubscribe(chat_id):
         await query.edit_message_text("⏹️ Automatic predictions stopped. Use /start to resume.")
     else:
         await query.edit_message_text("No active prediction job found.")
 
 
 async def main():
+    global broadcaster
     application = ApplicationBuilder().token(TELEGRAM_BOT_TOKEN).build()
+    broadcaster = Broadcaster(application.bot, on_blocked=unsubscribe)
 
     application.add_handler(CommandHandler("start", start))
     application.add_handler(CommandHandler("predict", predict_handler))
+    application.add_handler(CommandHandler("pairs", pairs_handler))
     application.add_handler(CallbackQueryHandler(stop_predictions_callback, pattern="stop_predictions"))
+    application.job_queue.run_repeating(broadcast_job, interval=BROADCAST_INTERVAL, first=BROADCAST_INTERVAL)
 
     logger.info("Telegram bot started.")
     await application.initialize()
@@ -107,6 +138,8 @@ async def main():
     await application.updater.idle()
     await application.stop()
     await application.shutdown()
+    if _session is not None:
+        await _session.close()
 
 
 if __name__ == "__main__":
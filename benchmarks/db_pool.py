@@ -0,0 +1,71 @@
+"""Requests/sec of the /predict DB write path, before and after pooling.
+
+"before" is a NullPool engine writing each pair with its own commit and
+refresh; "after" is the pooled engine from ``engine_options`` writing a
+whole sweep with ``save_predictions``. Runs against DATABASE_URL, or a
+throwaway SQLite file through aiosqlite when it is unset:
+
+    python -m benchmarks.db_pool --requests 500 --concurrency 20
+"""
+import os
+import time
+import asyncio
+import argparse
+import tempfile
+
+DEFAULT_URL = f"sqlite+aiosqlite:///{os.path.join(tempfile.gettempdir(), 'trader_agent_bench.db')}"
+os.environ.setdefault("DATABASE_URL", DEFAULT_URL)
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from backend.crud import save_prediction, save_predictions
+from backend.database.db import Base, engine_options
+
+PAIRS = ["XAU_USD", "EUR_USD", "GBP_USD", "USD_JPY", "AUD_USD"]
+SWEEP = [{"pair": p, "signal": "hold", "predicted_price": 1.0} for p in PAIRS]
+
+
+async def per_row(db):
+    for row in SWEEP:
+        await save_prediction(db, **row)
+
+
+async def batched(db):
+    await save_predictions(db, SWEEP)
+
+
+async def run(url, pool, write, requests, concurrency):
+    engine = create_async_engine(url, **engine_options(url, pool))
+    session = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore, session() as db:
+            await write(db)
+
+    await one()  # warm up
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+    return requests / elapsed
+
+
+async def main(url, requests, concurrency):
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+    print(f"{url} | {requests} requests | concurrency {concurrency}")
+    before = await run(url, "null", per_row, requests, concurrency)
+    print(f"before (NullPool, per-row commit): {before:8.1f} req/s")
+    after = await run(url, "queue", batched, requests, concurrency)
+    print(f"after  (pooled, batched insert):   {after:8.1f} req/s  ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(os.environ["DATABASE_URL"], args.requests, args.concurrency))
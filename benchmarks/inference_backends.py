@@ -0,0 +1,46 @@
+"""Latency of eager, int8, TorchScript and ONNX Runtime inference at batch 1 and N.
+
+Export the artifacts first with ``python -m ai_core.export``, then:
+
+    python -m benchmarks.inference_backends EUR_USD --batch 64
+"""
+import time
+import argparse
+import torch
+from ai_core.backends import BACKENDS, load_model
+from ai_core.export import check_parity, holdout_windows
+
+
+def time_call(model, x, repeats):
+    with torch.no_grad():
+        for _ in range(3):
+            model(x)
+        start = time.perf_counter()
+        for _ in range(repeats):
+            model(x)
+    return (time.perf_counter() - start) / repeats
+
+
+def main(pair, batch, repeats, backends):
+    windows = holdout_windows(pair, count=batch)
+    # int8 is lossy by design; its drift is measured by ai_core.quantize
+    check_parity(pair, [b for b in backends if b in ("torchscript", "onnx")], x=windows)
+
+    print(f"\n{pair} | {repeats} calls per cell")
+    print(f"{'Backend':<12}{'batch 1 (ms)':>14}{f'batch {batch} (ms)':>16}{'rows/s':>12}")
+    for backend in backends:
+        model = load_model(pair, backend)
+        single = time_call(model, windows[:1], repeats)
+        batched = time_call(model, windows, repeats)
+        print(f"{backend:<12}{single * 1e3:>14.2f}{batched * 1e3:>16.2f}{batch / batched:>12.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pair", nargs="?", default="EUR_USD")
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    args = parser.parse_args()
+
+    main(args.pair, args.batch, args.repeats, args.backends)
@@ -0,0 +1,70 @@
+"""Training and inference throughput of the legacy, batch-first and distilling informer layouts.
+
+Uses random windows so no trained artifacts are needed:
+
+    python -m benchmarks.informer_layouts --lookbacks 48 256 1024 --batch 64
+"""
+import time
+import argparse
+import torch
+import torch.nn as nn
+from ai_core.informer import SimpleInformer
+
+LAYOUTS = {
+    "legacy": dict(batch_first=False),
+    "batch_first": dict(batch_first=True),
+    "distil": dict(batch_first=True, distil=True),
+}
+
+
+def train_throughput(model, x, y, steps):
+    model.train()
+    optimizer = torch.optim.Adam(model.parameters(), lr=1e-3)
+    criterion = nn.MSELoss()
+
+    def step():
+        loss = criterion(model(x).squeeze(-1), y)
+        optimizer.zero_grad()
+        loss.backward()
+        optimizer.step()
+
+    step()
+    start = time.perf_counter()
+    for _ in range(steps):
+        step()
+    return steps * len(x) / (time.perf_counter() - start)
+
+
+def infer_throughput(model, x, steps):
+    model.eval()
+    with torch.inference_mode():
+        model(x)
+        start = time.perf_counter()
+        for _ in range(steps):
+            model(x)
+    return steps * len(x) / (time.perf_counter() - start)
+
+
+def main(lookbacks, batch, steps, layouts):
+    torch.manual_seed(0)
+    print(f"batch {batch} | {steps} steps per cell | {torch.get_num_threads()} thread(s)")
+    print(f"{'Layout':<13}{'Lookback':>9}{'train rows/s':>14}{'infer rows/s':>14}")
+    for lookback in lookbacks:
+        x = torch.randn(batch, lookback, 5)
+        y = torch.randn(batch)
+        for name in layouts:
+            model = SimpleInformer(input_dim=5, **LAYOUTS[name])
+            train = train_throughput(model, x, y, steps)
+            infer = infer_throughput(model, x, steps)
+            print(f"{name:<13}{lookback:>9}{train:>14.0f}{infer:>14.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lookbacks", type=int, nargs="+", default=[48, 256, 1024])
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--layouts", nargs="+", default=list(LAYOUTS), choices=LAYOUTS)
+    args = parser.parse_args()
+
+    main(args.lookbacks, args.batch, args.steps, args.layouts)
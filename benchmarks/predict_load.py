@@ -0,0 +1,68 @@
+"""Concurrent /predict?fresh=true callers against a running backend.
+
+For each concurrency level every caller asks for a fresh sweep at the same
+moment while a probe keeps hitting /history. The report shows how many
+sweeps the backend actually ran (from /inference/metrics), which should
+stay at one per burst however many callers join it:
+
+    uvicorn backend.main:app --port 8000
+    python -m benchmarks.predict_load --url http://localhost:8000 --levels 1 4 16 64
+"""
+import time
+import asyncio
+import argparse
+import httpx
+import numpy as np
+
+
+async def timed_get(client, path):
+    start = time.perf_counter()
+    response = await client.get(path)
+    return response.status_code, time.perf_counter() - start
+
+
+async def probe(client, stop, latencies):
+    while not stop.is_set():
+        _, seconds = await timed_get(client, "/history?limit=10")
+        latencies.append(seconds)
+        await asyncio.sleep(0.01)
+
+
+async def burst(client, callers):
+    before = (await client.get("/inference/metrics")).json()
+    stop, history = asyncio.Event(), []
+    prober = asyncio.create_task(probe(client, stop, history))
+    results = await asyncio.gather(*(timed_get(client, "/predict?fresh=true") for _ in range(callers)))
+    stop.set()
+    await prober
+    after = (await client.get("/inference/metrics")).json()
+
+    latencies = [seconds for _, seconds in results]
+    return {
+        "callers": callers,
+        "ok": sum(status == 200 for status, _ in results),
+        "sweeps": after["predict_sweeps"] - before["predict_sweeps"],
+        "model_runs": after["submitted"] - before["submitted"],
+        "predict_p50": np.percentile(latencies, 50),
+        "predict_p99": np.percentile(latencies, 99),
+        "history_p99": np.percentile(history, 99) if history else float("nan"),
+    }
+
+
+async def main(url, levels):
+    async with httpx.AsyncClient(base_url=url, timeout=120, limits=httpx.Limits(max_connections=None)) as client:
+        await client.get("/predict")  # warm up models and the cache
+        print(f"{'Callers':>8}{'200s':>6}{'Sweeps':>8}{'Model runs':>12}{'p50 (ms)':>10}{'p99 (ms)':>10}{'/history p99':>14}")
+        for callers in levels:
+            r = await burst(client, callers)
+            print(f"{r['callers']:>8}{r['ok']:>6}{r['sweeps']:>8}{r['model_runs']:>12}"
+                  f"{r['predict_p50'] * 1e3:>10.0f}{r['predict_p99'] * 1e3:>10.0f}{r['history_p99'] * 1e3:>14.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = parser.parse_args()
+
+    asyncio.run(main(args.url, args.levels))
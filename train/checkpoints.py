@@ -0,0 +1,52 @@
+import os
+import re
+import torch
+
+CHECKPOINT_DIR = "models/checkpoints"
+
+
+def checkpoint_dir(pair):
+    return os.path.join(CHECKPOINT_DIR, pair)
+
+
+def latest_checkpoint(pair):
+    """Path of the newest versioned checkpoint for ``pair``, or None."""
+    path = checkpoint_dir(pair)
+    if not os.path.isdir(path):
+        return None
+    versions = [int(m.group(1)) for f in os.listdir(path) if (m := re.fullmatch(r"v(\d+)\.pt", f))]
+    if not versions:
+        return None
+    return os.path.join(path, f"v{max(versions):04d}.pt")
+
+
+def load_checkpoint(path):
+    return torch.load(path, map_location="cpu")
+
+
+def save_checkpoint(pair, model, optimizer, last_time, samples):
+    """Write the next checkpoint version and refresh the served model weights.
+
+    ``last_time`` is the open time of the newest candle the model was
+    trained on, so the next fine-tune knows where new data starts.
+    """
+    latest = latest_checkpoint(pair)
+    version = int(os.path.basename(latest)[1:-3]) + 1 if latest else 1
+
+    os.makedirs(checkpoint_dir(pair), exist_ok=True)
+    path = os.path.join(checkpoint_dir(pair), f"v{version:04d}.pt")
+    torch.save({
+        "version": version,
+        "model": model.state_dict(),
+        "optimizer": optimizer.state_dict(),
+        "last_time": last_time.value,
+        "samples": samples,
+    }, path)
+
+    # write then rename so the serving registry never sees a partial file
+    os.makedirs("models", exist_ok=True)
+    tmp = f"models/informer_{pair}.pth.tmp"
+    torch.save(model.state_dict(), tmp)
+    os.replace(tmp, f"models/informer_{pair}.pth")
+    print(f"Saved model: informer_{pair}.pth (checkpoint v{version:04d})")
+    return path
@@ -0,0 +1,94 @@
+"""Training loop shared by full training and fine-tuning.
+
+Compare loop settings on one pair's data:
+
+    python -m train.engine EUR_USD --configs fp32 bf16 compile --epochs 1
+"""
+import os
+import time
+import argparse
+import joblib
+import torch
+import torch.nn as nn
+from torch.utils.data import DataLoader, TensorDataset
+from ai_core.informer import SimpleInformer
+from utils.model_utils import preprocess_pair
+
+CONFIGS = {
+    "fp32": {},
+    "bf16": dict(bf16=True),
+    "compile": dict(compile=True),
+    "compile+bf16": dict(compile=True, bf16=True),
+    "loader-2w": dict(workers=2),
+    "accum-4": dict(batch_size=16, accumulate=4),
+}
+
+
+def make_loader(dataset, batch_size=64, shuffle=True, workers=0, pin_memory=False):
+    return DataLoader(dataset, batch_size=batch_size, shuffle=shuffle, num_workers=workers,
+                      pin_memory=pin_memory, persistent_workers=workers > 0)
+
+
+def fit(pair, model, optimizer, loader, epochs, compile=False, bf16=False, accumulate=1):
+    """Train ``model`` in place and return the wall time of each epoch.
+
+    The running loss stays on the tensor side and is read once per epoch,
+    so steps never wait on a ``.item()`` sync. With ``accumulate`` > 1 the
+    optimizer steps every ``accumulate`` batches.
+    """
+    criterion = nn.MSELoss()
+    forward = torch.compile(model) if compile else model
+    model.train()
+    epoch_seconds = []
+    for epoch in range(epochs):
+        start = time.perf_counter()
+        total = torch.zeros(())
+        optimizer.zero_grad(set_to_none=True)
+        for i, (xb, yb) in enumerate(loader, 1):
+            with torch.autocast("cpu", dtype=torch.bfloat16, enabled=bf16):
+                pred = forward(xb).squeeze(-1)
+            loss = criterion(pred.float(), yb)
+            (loss / accumulate).backward()
+            if i % accumulate == 0 or i == len(loader):
+                optimizer.step()
+                optimizer.zero_grad(set_to_none=True)
+            total += loss.detach()
+        epoch_seconds.append(time.perf_counter() - start)
+        print(f"{pair} | Epoch {epoch+1} | Loss: {total.item() / len(loader):.4f} | {epoch_seconds[-1]:.1f}s")
+    return epoch_seconds
+
+
+def benchmark(pair, configs=CONFIGS, epochs=1, lr=1e-3):
+    """Train a fresh model per loop configuration and report throughput."""
+    # reuse the served scaler rather than refitting and overwriting it
+    path = f"models/scalers/{pair}_scaler.pkl"
+    X, y, _ = preprocess_pair(pair, scaler=joblib.load(path) if os.path.exists(path) else None)
+    dataset = TensorDataset(X, y)
+    results = []
+    for name, options in configs.items():
+        options = dict(options)
+        loader = make_loader(dataset, options.pop("batch_size", 64), workers=options.pop("workers", 0),
+                             pin_memory=options.pop("pin_memory", False))
+        torch.manual_seed(0)
+        model = SimpleInformer(input_dim=5)
+        optimizer = torch.optim.Adam(model.parameters(), lr=lr)
+        seconds = fit(f"{pair} [{name}]", model, optimizer, loader, epochs, **options)
+        # the first epoch pays for compilation and worker start-up
+        steady = seconds[1:] or seconds
+        results.append((name, seconds[0], sum(steady) / len(steady)))
+
+    print(f"\n{pair} | {len(X)} samples | {torch.get_num_threads()} thread(s)")
+    print(f"{'Config':<15}{'First epoch (s)':>17}{'Epoch (s)':>11}{'Samples/s':>11}")
+    for name, first, epoch in results:
+        print(f"{name:<15}{first:>17.1f}{epoch:>11.1f}{len(X) / epoch:>11.0f}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare training loop settings on one pair.")
+    parser.add_argument("pair", nargs="?", default="EUR_USD")
+    parser.add_argument("--configs", nargs="+", default=list(CONFIGS), choices=CONFIGS)
+    parser.add_argument("--epochs", type=int, default=2)
+    args = parser.parse_args()
+
+    benchmark(args.pair, {name: CONFIGS[name] for name in args.configs}, args.epochs)
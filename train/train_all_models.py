@@ -1,34 +1,175 @@
 import os
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import joblib
+import numpy as np
+import pandas as pd
 import torch
-import torch.nn as nn
 import torch.optim as optim
-from torch.utils.data import DataLoader, TensorDataset
+from torch.utils.data import Subset, TensorDataset
 from utils.model_utils import preprocess_pair
-from ai_core.informer import SimpleInformer
+from ai_core.informer import SimpleInformer, build_informer
+from ai_core.backends import model_path
+from ai_core.export import export_pair
+from train.checkpoints import latest_checkpoint, load_checkpoint, save_checkpoint
+from train.engine import fit, make_loader
 
-def train_model(pair, epochs=10, lr=1e-3):
-    X, y = preprocess_pair(pair)
-    dataset = DataLoader(TensorDataset(X, y), batch_size=64, shuffle=True)
+PAIRS = ["XAU_USD", "EUR_USD", "GBP_USD", "USD_JPY", "AUD_USD"]
 
-    model = SimpleInformer(input_dim=5)
-    criterion = nn.MSELoss()
+
+def _stats(pair, start, samples, epoch_seconds):
+    seconds = time.perf_counter() - start
+    return {
+        "pair": pair,
+        "seconds": seconds,
+        "samples": samples,
+        "samples_per_sec": samples / seconds,
+        "epoch_seconds": sum(epoch_seconds) / len(epoch_seconds),
+        "threads": torch.get_num_threads(),
+    }
+
+
+def _engine(engine):
+    """Split engine options into DataLoader and ``fit`` keyword arguments."""
+    engine = dict(engine or {})
+    loader = {k: engine.pop(k) for k in ("batch_size", "workers", "pin_memory") if k in engine}
+    return loader, engine
+
+
+def train_model(pair, epochs=10, lr=1e-3, distil=False, engine=None):
+    start = time.perf_counter()
+    X, y, times = preprocess_pair(pair)
+    loader_options, fit_options = _engine(engine)
+    dataset = make_loader(TensorDataset(X, y), **loader_options)
+
+    model = SimpleInformer(input_dim=5, distil=distil)
     optimizer = optim.Adam(model.parameters(), lr=lr)
+    epoch_seconds = fit(pair, model, optimizer, dataset, epochs, **fit_options)
+
+    # the newest candle trained on, not whatever the API appended during the fit
+    save_checkpoint(pair, model, optimizer, pd.Timestamp(int(times[-1]), tz="UTC"), len(X))
+    return _stats(pair, start, len(X) * epochs, epoch_seconds)
+
+
+def finetune_model(pair, epochs=2, lr=1e-4, replay=2048, lookback=48, pred_step=1, engine=None, since=None):
+    """Continue training from the latest checkpoint on candles that arrived
+    since it was written, mixed with a random replay sample of older windows.
+
+    Without a checkpoint the served ``models/informer_{pair}.pth`` is the
+    starting point, with a fresh optimizer; new data then starts at
+    ``since`` or, by default, the file's modification time. ``since``
+    overrides the checkpoint's time as well.
+    """
+    start = time.perf_counter()
+    path = latest_checkpoint(pair)
+    if path is not None:
+        checkpoint = load_checkpoint(path)
+        model = build_informer(checkpoint["model"])
+        optimizer = optim.Adam(model.parameters(), lr=lr)
+        optimizer.load_state_dict(checkpoint["optimizer"])
+        for group in optimizer.param_groups:
+            group["lr"] = lr
+        last_time = checkpoint["last_time"]
+        source = f"checkpoint v{checkpoint['version']:04d}"
+    elif os.path.exists(model_path(pair)):
+        model = build_informer(torch.load(model_path(pair), map_location="cpu"))
+        optimizer = optim.Adam(model.parameters(), lr=lr)
+        last_time = pd.Timestamp(os.path.getmtime(model_path(pair)), unit="s", tz="UTC").value
+        source = os.path.basename(model_path(pair))
+    else:
+        print(f"{pair}: no model to fine-tune from, running a full train")
+        return train_model(pair, engine=engine)
+    if since is not None:
+        last_time = pd.Timestamp(since, tz="UTC").value
+
+    scaler = joblib.load(f"models/scalers/{pair}_scaler.pkl")
+    X, y, times = preprocess_pair(pair, lookback, pred_step, scaler=scaler)
+
+    # sample i targets candle i + lookback + pred_step
+    first_new = int(np.searchsorted(times, last_time, side="right"))
+    split = min(max(first_new - lookback - pred_step, 0), len(X))
+    if split == len(X):
+        print(f"{pair}: no new candles since {source}")
+        return None
+
+    old = torch.randperm(split)[:replay]
+    indices = torch.cat([torch.arange(split, len(X)), old]).tolist()
+    loader_options, fit_options = _engine(engine)
+    dataset = make_loader(Subset(TensorDataset(X, y), indices), **loader_options)
+    print(f"{pair}: fine-tuning {source} on {len(X) - split} new + {len(old)} replay samples")
+
+    epoch_seconds = fit(pair, model, optimizer, dataset, epochs, **fit_options)
+
+    save_checkpoint(pair, model, optimizer, pd.Timestamp(int(times[-1]), tz="UTC"), len(indices))
+    return _stats(pair, start, len(indices) * epochs, epoch_seconds)
+
+
+def _init_worker(threads):
+    torch.set_num_threads(threads)
+    torch.set_num_interop_threads(1)
+
+
+def _run(pair, finetune, epochs, lr, export, distil=False, engine=None, since=None):
+    kwargs = {k: v for k, v in (("epochs", epochs), ("lr", lr)) if v is not None}
+    kwargs["engine"] = engine
+    stats = finetune_model(pair, since=since, **kwargs) if finetune else train_model(pair, distil=distil, **kwargs)
+    if export and stats is not None:
+        try:
+            export_pair(pair)
+        except Exception as e:
+            # the model is already trained and saved; keep its stats in the report
+            print(f"❌ Export failed for {pair}: {e}")
+    return stats
+
+
+def train_all(pairs=PAIRS, workers=None, epochs=None, lr=None, finetune=False, export=False, distil=False, engine=None, since=None):
+    cpus = os.cpu_count() or 1
+    workers = max(1, min(workers or cpus, len(pairs), cpus))
+    threads = max(1, cpus // workers)
+    print(f"Training {len(pairs)} pairs with {workers} worker(s) x {threads} thread(s)")
+
+    start = time.perf_counter()
+    stats = []
+    if workers == 1:
+        torch.set_num_threads(threads)
+        stats = [_run(p, finetune, epochs, lr, export, distil, engine, since) for p in pairs]
+    else:
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                 initializer=_init_worker, initargs=(threads,)) as executor:
+            futures = {executor.submit(_run, p, finetune, epochs, lr, export, distil, engine, since): p for p in pairs}
+            for future in as_completed(futures):
+                stats.append(future.result())
+    total = time.perf_counter() - start
+    stats = [s for s in stats if s is not None]
+
+    print(f"\n{'Pair':<10}{'Wall (s)':>10}{'Epoch (s)':>11}{'Samples':>12}{'Samples/s':>12}{'Threads':>9}")
+    for s in sorted(stats, key=lambda s: s["pair"]):
+        print(f"{s['pair']:<10}{s['seconds']:>10.1f}{s['epoch_seconds']:>11.1f}{s['samples']:>12}{s['samples_per_sec']:>12.0f}{s['threads']:>9}")
+    samples = sum(s["samples"] for s in stats)
+    print(f"{'Total':<10}{total:>10.1f}{'':>11}{samples:>12}{samples / total:>12.0f}")
+    return stats
 
-    for epoch in range(epochs):
-        losses = []
-        for xb, yb in dataset:
-            pred = model(xb).squeeze()
-            loss = criterion(pred, yb)
-            optimizer.zero_grad()
-            loss.backward()
-            optimizer.step()
-            losses.append(loss.item())
-        print(f"{pair} | Epoch {epoch+1} | Loss: {sum(losses)/len(losses):.4f}")
-
-    os.makedirs("models", exist_ok=True)
-    torch.save(model.state_dict(), f"models/informer_{pair}.pth")
-    print(f"Saved model: informer_{pair}.pth")
 
 if __name__ == "__main__":
-    for p in ["XAU_USD", "EUR_USD", "GBP_USD", "USD_JPY", "AUD_USD"]:
-        train_model(p)
+    parser = argparse.ArgumentParser(description="Train informer models for each pair.")
+    parser.add_argument("pairs", nargs="*", default=PAIRS)
+    parser.add_argument("--workers", type=int, default=None, help="parallel training processes (default: one per pair, capped at CPU count)")
+    parser.add_argument("--epochs", type=int, default=None, help="default: 10, or 2 with --finetune")
+    parser.add_argument("--lr", type=float, default=None, help="default: 1e-3, or 1e-4 with --finetune")
+    parser.add_argument("--finetune", action="store_true", help="warm-start from the latest checkpoint on new candles only")
+    parser.add_argument("--export", action="store_true", help="also export TorchScript and ONNX artifacts and check parity")
+    parser.add_argument("--distil", action="store_true", help="halve the sequence between encoder layers (Informer distilling); ignored with --finetune")
+    parser.add_argument("--since", default=None, help="with --finetune: treat candles after this UTC time as new (default: checkpoint or .pth time)")
+    parser.add_argument("--compile", action="store_true", help="train through torch.compile")
+    parser.add_argument("--bf16", action="store_true", help="bfloat16 autocast on CPU")
+    parser.add_argument("--accumulate", type=int, default=1, help="batches per optimizer step")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--loader-workers", type=int, default=0, help="DataLoader worker processes per training process")
+    args = parser.parse_args()
+
+    engine = dict(compile=args.compile, bf16=args.bf16, accumulate=args.accumulate,
+                  batch_size=args.batch_size, workers=args.loader_workers)
+    train_all(args.pairs, args.workers, args.epochs, args.lr, args.finetune, args.export, args.distil, engine, args.since)
@@ -0,0 +1,132 @@
+import os
+import json
+import asyncio
+import httpx
+import pandas as pd
+from dotenv import load_dotenv
+from utils.data_fetcher import (
+    CANDLE_WINDOW,
+    MAX_COUNT,
+    save_candles,
+    store_new_candles,
+    sync_params,
+    to_rfc3339,
+)
+
+load_dotenv()
+
+OANDA_URLS = {
+    "practice": "https://api-fxpractice.oanda.com",
+    "live": "https://api-fxtrade.oanda.com",
+}
+
+
+class AsyncCandleClient:
+    """Non-blocking OANDA candle client sharing one pooled HTTP session.
+
+    Point ``base_url`` (or ``OANDA_API_URL``) at a local stub server, or set
+    ``fixture_dir`` (or ``OANDA_FIXTURE_DIR``) to serve recorded
+    ``{pair}.json`` responses without touching the network. With
+    ``record=True`` live responses are written to ``fixture_dir``.
+
+    Only the HTTP requests run on the event loop; JSON decoding, fixture
+    files, frame parsing and every candle store read or write go through
+    ``asyncio.to_thread``.
+    """
+
+    def __init__(self, api_key=None, base_url=None, max_concurrency=4,
+                 fixture_dir=None, record=False, timeout=30, transport=None):
+        self.api_key = api_key or os.getenv("OANDA_API_KEY")
+        self.base_url = base_url or os.getenv("OANDA_API_URL") or OANDA_URLS[os.getenv("OANDA_ENV", "practice")]
+        self.max_concurrency = max_concurrency
+        self.fixture_dir = fixture_dir or os.getenv("OANDA_FIXTURE_DIR")
+        self.record = record
+        self.timeout = timeout
+        self.transport = transport
+        self._session = None
+        self._semaphore = None
+
+    def _get_session(self):
+        if self._session is None or self._session.is_closed:
+            self._session = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                limits=httpx.Limits(max_connections=self.max_concurrency,
+                                    max_keepalive_connections=self.max_concurrency),
+                timeout=self.timeout,
+                transport=self.transport,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    def _fixture_path(self, pair):
+        return os.path.join(self.fixture_dir, f"{pair}.json")
+
+    def _read_fixture(self, pair):
+        with open(self._fixture_path(pair)) as f:
+            return json.load(f)
+
+    def _decode(self, pair, content):
+        payload = json.loads(content)
+        if self.fixture_dir and self.record:
+            os.makedirs(self.fixture_dir, exist_ok=True)
+            with open(self._fixture_path(pair), "w") as f:
+                json.dump(payload, f)
+        return payload
+
+    async def fetch_candles(self, pair, granularity="M5", count=5000, **params):
+        if self.fixture_dir and not self.record:
+            return (await asyncio.to_thread(self._read_fixture, pair))["candles"]
+
+        session = self._get_session()
+        params = {"granularity": granularity, "count": count, "price": "M", **params}
+        async with self._semaphore:
+            response = await session.get(f"/v3/instruments/{pair}/candles", params=params)
+        response.raise_for_status()
+        # a 5000-candle payload is large enough to stall the loop while decoding
+        payload = await asyncio.to_thread(self._decode, pair, response.content)
+        return payload["candles"]
+
+    async def fetch_pair(self, pair, granularity="M5", count=5000):
+        candles = await self.fetch_candles(pair, granularity, count)
+        return await asyncio.to_thread(save_candles, pair, candles)
+
+    async def fetch_pairs(self, pairs, granularity="M5", count=5000):
+        frames = await asyncio.gather(*(self.fetch_pair(p, granularity, count) for p in pairs))
+        return dict(zip(pairs, frames))
+
+    async def sync_pair(self, pair, granularity="M5", window=CANDLE_WINDOW):
+        # the first get_store of a pair may import and convert a legacy store
+        params = await asyncio.to_thread(sync_params, pair)
+        if params is None:
+            return await self.fetch_pair(pair, granularity, min(window, MAX_COUNT))
+
+        frames = []
+        while True:
+            candles = await self.fetch_candles(pair, granularity, MAX_COUNT, **params)
+            df = await asyncio.to_thread(store_new_candles, pair, candles)
+            frames.append(df)
+            if len(candles) < MAX_COUNT or df.empty:
+                break
+            params = {"from": to_rfc3339(df["time"].iloc[-1]), "includeFirst": "false"}
+        return pd.concat(frames, ignore_index=True)
+
+    async def sync_pairs(self, pairs, granularity="M5", window=CANDLE_WINDOW):
+        frames = await asyncio.gather(*(self.sync_pair(p, granularity, window) for p in pairs))
+        return dict(zip(pairs, frames))
+
+    async def aclose(self):
+        if self._session is not None:
+            await self._session.aclose()
+            self._session = None
+
+
+client = AsyncCandleClient()
+
+
+async def fetch_pairs(pairs, granularity="M5", count=5000):
+    return await client.fetch_pairs(pairs, granularity, count)
+
+
+async def sync_pairs(pairs, granularity="M5", window=CANDLE_WINDOW):
+    return await client.sync_pairs(pairs, granularity, window)
@@ -0,0 +1,148 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+
+STORE_DIR = "data/store"
+FEATURES = ["open", "high", "low", "close", "volume"]
+
+TIME_DTYPE = np.dtype("<i8")
+VALUE_DTYPE = np.dtype("<f8")
+# one fixed-size record per candle, so times and values can never disagree on length
+RECORD_DTYPE = np.dtype([("time", TIME_DTYPE), ("ohlcv", VALUE_DTYPE, (len(FEATURES),))])
+
+
+class CandleStore:
+    """Append-only binary candle storage for one pair.
+
+    Each candle is one record in ``candles.bin``: its open time as int64
+    UTC nanoseconds followed by the float64 OHLCV row. Appends are a single
+    write and ``replace`` is a single rename, so a crash can at worst leave
+    a partial trailing record, which readers ignore and the next append
+    truncates. Tail reads only touch the last records and ``read``
+    memory-maps the whole history without copying.
+    """
+
+    def __init__(self, pair, root=STORE_DIR):
+        self.pair = pair
+        self.dir = os.path.join(root, pair)
+        self.path = os.path.join(self.dir, "candles.bin")
+        self.lock = threading.RLock()
+        self._import_legacy()
+
+    def _import_legacy(self):
+        # stores written before the single-file layout kept time.i8 and ohlcv.f8 side by side
+        time_path, values_path = os.path.join(self.dir, "time.i8"), os.path.join(self.dir, "ohlcv.f8")
+        if self.exists() or not (os.path.exists(time_path) and os.path.exists(values_path)):
+            return
+        times = np.fromfile(time_path, dtype=TIME_DTYPE)
+        values = np.fromfile(values_path, dtype=VALUE_DTYPE)
+        n = min(len(times), len(values) // len(FEATURES))
+        self.replace(times[:n], values[:n * len(FEATURES)])
+        os.remove(time_path)
+        os.remove(values_path)
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def __len__(self):
+        if not self.exists():
+            return 0
+        return os.path.getsize(self.path) // RECORD_DTYPE.itemsize
+
+    @staticmethod
+    def _records(times, values):
+        times = np.asarray(times, dtype=TIME_DTYPE)
+        records = np.empty(len(times), dtype=RECORD_DTYPE)
+        records["time"] = times
+        records["ohlcv"] = np.asarray(values, dtype=VALUE_DTYPE).reshape(-1, len(FEATURES))
+        return records
+
+    def append(self, times, values):
+        records = self._records(times, values)
+        with self.lock:
+            os.makedirs(self.dir, exist_ok=True)
+            size = len(self) * RECORD_DTYPE.itemsize
+            # drop any partial record left behind by an interrupted append
+            if self.exists() and os.path.getsize(self.path) != size:
+                os.truncate(self.path, size)
+            with open(self.path, "ab") as f:
+                f.write(records.tobytes())
+
+    def replace(self, times, values):
+        records = self._records(times, values)
+        with self.lock:
+            os.makedirs(self.dir, exist_ok=True)
+            tmp = self.path + ".tmp"
+            records.tofile(tmp)
+            os.replace(tmp, self.path)
+
+    def tail(self, n):
+        with self.lock:
+            total = len(self)
+            n = min(n, total)
+            records = np.fromfile(self.path, dtype=RECORD_DTYPE, count=n,
+                                  offset=(total - n) * RECORD_DTYPE.itemsize) if n else np.empty(0, RECORD_DTYPE)
+        return records["time"], records["ohlcv"]
+
+    def read(self):
+        with self.lock:
+            n = len(self)
+            if n == 0:
+                return np.empty(0, TIME_DTYPE), np.empty((0, len(FEATURES)), VALUE_DTYPE)
+            records = np.memmap(self.path, dtype=RECORD_DTYPE, mode="r", shape=(n,))
+        return records["time"], records["ohlcv"]
+
+    def trim(self, window):
+        with self.lock:
+            if len(self) > window:
+                self.replace(*self.tail(window))
+
+    def first_time(self):
+        if len(self) == 0:
+            return None
+        with self.lock:
+            records = np.fromfile(self.path, dtype=RECORD_DTYPE, count=1)
+        return pd.Timestamp(int(records["time"][0]), tz="UTC")
+
+    def last_time(self):
+        if len(self) == 0:
+            return None
+        times, _ = self.tail(1)
+        return pd.Timestamp(int(times[0]), tz="UTC")
+
+    def append_frame(self, df):
+        if not df.empty:
+            self.append(*frame_to_arrays(df))
+
+    def replace_frame(self, df):
+        self.replace(*frame_to_arrays(df))
+
+    def to_frame(self, n=None):
+        times, values = self.read() if n is None else self.tail(n)
+        df = pd.DataFrame(np.asarray(values), columns=FEATURES)
+        df.insert(0, "time", pd.to_datetime(np.asarray(times), utc=True))
+        return df
+
+
+def frame_to_arrays(df):
+    times = pd.to_datetime(df["time"], utc=True).astype("datetime64[ns, UTC]")
+    return times.array.asi8, df[FEATURES].to_numpy(dtype=VALUE_DTYPE)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(pair, root=STORE_DIR):
+    """Shared store for ``pair``, seeded from ``data/{pair}.csv`` on first use."""
+    key = (root, pair)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = CandleStore(pair, root)
+            csv_path = f"data/{pair}.csv"
+            if not store.exists() and os.path.exists(csv_path):
+                store.replace_frame(pd.read_csv(csv_path))
+                print(f" Imported {csv_path} into {store.dir}")
+    return store
@@ -3,21 +3,23 @@ import pandas as pd
 from oandapyV20 import API
 import oandapyV20.endpoints.instruments as instruments
 from dotenv import load_dotenv
+from utils.candle_store import frame_to_arrays, get_store
+from utils.model_utils import push_candles, reset_window
 
 load_dotenv()
 
 client = API(access_token=os.getenv("OANDA_API_KEY"))
 
-def fetch_pair(pair, granularity="M5",count=5000):
-    r = instruments.InstrumentsCandles(instrument=pair,params={
-    "granularity":granularity,
-    "count":count,
-    "price":"M"})
-    try:
-        client.request(r)
-    except Exception as e:
-        print(f"Failed to fetch{pair} : {e}")
-    candles = r.response["candles"]
+# candles downloaded when a pair has no local history yet
+CANDLE_WINDOW = int(os.getenv("CANDLE_WINDOW", 5000))
+# candles kept in the store; 0 keeps the full history for training
+CANDLE_HISTORY = int(os.getenv("CANDLE_HISTORY", 0))
+TRIM_SLACK = 500
+MAX_COUNT = 5000
+GRANULARITY_SECONDS = {"S5": 5, "M1": 60, "M5": 300, "M15": 900, "M30": 1800,
+                       "H1": 3600, "H4": 14400, "D": 86400}
+
+def candles_to_frame(candles):
     data=[{
         "time":c["time"],
         "open":float(c["mid"]["o"]),
@@ -28,14 +30,99 @@ def fetch_pair(pair, granularity="M5",count=5000):
 
     } for c in candles if c["complete"]]
 
-    df = pd.DataFrame(data)
+    df = pd.DataFrame(data, columns=["time", "open", "high", "low", "close", "volume"])
     df["time"] = pd.to_datetime(df["time"],utc = True)
-    os.makedirs("data", exist_ok=True)
-    df.to_csv(f"data/{pair}.csv", index=False)
-    print(f" Saved data/{pair}.csv")
+    return df
+
+def save_pair(pair, df):
+    store = get_store(pair)
+    store.replace_frame(df)
+    reset_window(pair)
+    print(f" Saved {store.dir}")
+
+def save_candles(pair, candles):
+    """Replace the stored history with raw OANDA ``candles``; returns their frame."""
+    df = candles_to_frame(candles)
+    save_pair(pair, df)
+    return df
+
+def last_candle_time(pair):
+    """Open time of the newest complete candle stored for ``pair``, or None."""
+    return get_store(pair).last_time()
+
+def append_candles(pair, df, history=CANDLE_HISTORY):
+    store = get_store(pair)
+    if df.empty:
+        return
+    times, values = frame_to_arrays(df)
+    with store.lock:
+        store.append(times, values)
+        if history and len(store) > history + TRIM_SLACK:
+            store.trim(history)
+    push_candles(pair, times, values)
+
+def new_candles(pair, candles):
+    df = candles_to_frame(candles)
+    last = last_candle_time(pair)
+    if last is not None:
+        df = df[df["time"] > last]
+    return df
 
+def store_new_candles(pair, candles):
+    """Append the raw OANDA ``candles`` newer than the stored ones; returns the appended frame."""
+    df = new_candles(pair, candles)
+    append_candles(pair, df)
     return df
 
+def to_rfc3339(ts):
+    return ts.tz_convert("UTC").strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def sync_params(pair):
+    """Request params for an incremental sync, or None when the pair has no history yet.
+
+    Stored history is never replaced by a fresh download; a long gap is
+    filled by paging forward from the last stored candle.
+    """
+    last = last_candle_time(pair)
+    if last is None:
+        return None
+    return {"from": to_rfc3339(last), "includeFirst": "false"}
+
+def fetch_pair(pair, granularity="M5",count=5000):
+    r = instruments.InstrumentsCandles(instrument=pair,params={
+    "granularity":granularity,
+    "count":count,
+    "price":"M"})
+    try:
+        client.request(r)
+    except Exception as e:
+        print(f"Failed to fetch{pair} : {e}")
+    return save_candles(pair, r.response["candles"])
+
+def sync_pair(pair, granularity="M5", window=CANDLE_WINDOW):
+    """Fetch only candles newer than the last stored one and append them,
+    falling back to a ``window``-candle download when there is no local history."""
+    params = sync_params(pair)
+    if params is None:
+        return fetch_pair(pair, granularity, min(window, MAX_COUNT))
+
+    frames = []
+    while True:
+        r = instruments.InstrumentsCandles(instrument=pair, params={
+            "granularity": granularity,
+            "count": MAX_COUNT,
+            "price": "M",
+            **params})
+        client.request(r)
+        candles = r.response["candles"]
+        df = store_new_candles(pair, candles)
+        frames.append(df)
+        if len(candles) < MAX_COUNT or df.empty:
+            break
+        params = {"from": to_rfc3339(df["time"].iloc[-1]), "includeFirst": "false"}
+
+    return pd.concat(frames, ignore_index=True)
+
 if __name__ == "__main__":
     for p in[ "XAU_USD", "EUR_USD", "GBP_USD", "USD_JPY", "AUD_USD"]:
         fetch_pair(p)
\ No newline at end of file
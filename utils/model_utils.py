@@ -2,45 +2,108 @@ import pandas as pd
 import numpy as np
 import torch
 import joblib
+import threading
 from sklearn.preprocessing import MinMaxScaler
 from pathlib import Path
+from utils.candle_store import FEATURES, get_store
 
 
-def preprocess_pair(pair: str, lookback=48, pred_step=1):
-    
-    path = f"data/{pair}.csv"
-    df = pd.read_csv(path)
-    df = df[["open", "high", "low", "close", "volume"]]
+def preprocess_pair(pair: str, lookback=48, pred_step=1, scaler=None):
+    """Training windows ``X``, next-close targets ``y`` and the candle times
+    they were built from, all from one read of the store."""
+    times, values = get_store(pair).read()
+    df = pd.DataFrame(values, columns=FEATURES, copy=False)
 
-    scaler = MinMaxScaler()
-    scaled = scaler.fit_transform(df)
+    # an existing scaler is reused as-is so fine-tuned weights stay compatible
+    if scaler is None:
+        scaler = MinMaxScaler()
+        scaled = scaler.fit_transform(df)
 
-    
-    Path("models/scalers/").mkdir(parents=True, exist_ok=True)
-    joblib.dump(scaler, f"models/scalers/{pair}_scaler.pkl")
+        Path("models/scalers/").mkdir(parents=True, exist_ok=True)
+        joblib.dump(scaler, f"models/scalers/{pair}_scaler.pkl")
+    else:
+        scaled = scaler.transform(df)
 
-    X, y = [], []
-    for i in range(lookback, len(scaled) - pred_step):
-        X.append(scaled[i - lookback:i])
-        y.append(scaled[i + pred_step][3])  # predict 'close'
+    # windows are strided views over the scaled rows, so memory stays O(rows)
+    data = torch.from_numpy(scaled.astype(np.float32))
+    count = len(data) - lookback - pred_step
+    if count <= 0:
+        raise ValueError(f"{pair}: need more than {lookback + pred_step} candles, got {len(data)}")
 
-    X = torch.tensor(np.array(X), dtype=torch.float32)
-    y = torch.tensor(np.array(y), dtype=torch.float32)
+    X = data.unfold(0, lookback, 1)[:count].transpose(1, 2)  # shape: (count, lookback, 5)
+    y = data[lookback + pred_step:, 3]  # predict 'close'
 
-    return X, y
+    return X, y, times
 
 
-def load_latest_sequence(pair: str, lookback=48):
-   
-    df = pd.read_csv(f"data/{pair}.csv")
-    df = df[["open", "high", "low", "close", "volume"]]
+class FeatureWindow:
+    """Ring buffer of the last ``lookback`` scaled OHLCV rows of one pair."""
 
-    
-    scaler_path = f"models/scalers/{pair}_scaler.pkl"
-    scaler = joblib.load(scaler_path)
+    def __init__(self, scaler, lookback=48):
+        self.scaler = scaler
+        self.lookback = lookback
+        self.rows = np.zeros((lookback, len(FEATURES)), dtype=np.float32)
+        self.pos = 0
+        self.size = 0
+        self.last_time = None
+        self.lock = threading.Lock()
 
-    scaled = scaler.transform(df)
-    recent_seq = scaled[-lookback:]
-    recent_seq = torch.tensor(recent_seq, dtype=torch.float32).unsqueeze(0)  # shape: (1, lookback, 5)
+    def extend(self, times, values):
+        times = np.asarray(times)
+        with self.lock:
+            if self.last_time is not None:
+                keep = times > self.last_time
+                times, values = times[keep], values[keep]
+            if len(times) == 0:
+                return
+            values = values[-self.lookback:]
+            scaled = self.scaler.transform(pd.DataFrame(values, columns=FEATURES))
+            for row in scaled:
+                self.rows[self.pos] = row
+                self.pos = (self.pos + 1) % self.lookback
+            self.size = min(self.size + len(scaled), self.lookback)
+            self.last_time = times[-1]
+
+    def tensor(self):
+        with self.lock:
+            if self.size < self.lookback:
+                raise ValueError(f"Only {self.size} of {self.lookback} candles available")
+            ordered = np.concatenate((self.rows[self.pos:], self.rows[:self.pos]))
+        return torch.from_numpy(ordered).unsqueeze(0)  # shape: (1, lookback, 5)
+
+
+_windows = {}
+_windows_lock = threading.Lock()
+
+
+def get_window(pair: str, scaler, lookback=48):
+    with _windows_lock:
+        window = _windows.get(pair)
+        if window is None or window.scaler is not scaler or window.lookback != lookback:
+            window = FeatureWindow(scaler, lookback)
+            window.extend(*get_store(pair).tail(lookback))
+            _windows[pair] = window
+    return window
+
+
+def push_candles(pair: str, times, values):
+    """Feed newly stored candles into the pair's window, scaling only the new rows."""
+    window = _windows.get(pair)
+    if window is not None:
+        window.extend(times, values)
+
+
+def reset_window(pair: str):
+    with _windows_lock:
+        _windows.pop(pair, None)
+
+
+def load_latest_sequence(pair: str, lookback=48, scaler=None):
+
+    if scaler is None:
+        scaler_path = f"models/scalers/{pair}_scaler.pkl"
+        scaler = joblib.load(scaler_path)
+
+    recent_seq = get_window(pair, scaler, lookback).tensor()
 
     return recent_seq, scaler